@@ -1,8 +1,11 @@
-from . import methods, models
+from . import exceptions, methods, models
 from .avito import Avito
+from .pool import AvitoPool
 
 __all__ = (
     "Avito",
+    "AvitoPool",
+    "exceptions",
     "methods",
     "models"
 )
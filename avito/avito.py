@@ -1,22 +1,58 @@
-from pprint import pformat
-from typing import Generic, TypeVar
+import asyncio
+import os
+import time
+from typing import AsyncIterable, AsyncIterator, Generic, Iterable, TypeVar
 
 import aiohttp
 import orjson
 from loguru import logger
+from pydantic import ValidationError
 
 from .base.methods import AvitoMethod, AvitoType
+from .exceptions import (
+    AvitoAPIError,
+    AvitoError,
+    BadResponseError,
+    NetworkError,
+    ServerError,
+    TooManyRequestsError,
+    UnauthorizedError,
+)
 from .base.models import AvitoObject
+from .base.projection import as_projection, prefixed
+from .base.trusted import construct
 from .methods import (
+    GetChats,
+    GetMessages,
     GetRatingsInfo,
     GetSubscriptions,
     GetToken,
     GetUserBalance,
     GetUserInfoSelf,
 )
-from .models import Balance, RatingInfo, Token, UserInfoSelf
-from .schema.messenger.methods import PostWebhook, SendImage, UploadImage
+from .broadcast import BroadcastResult, broadcast
+from .cache import ResponseCache
+from .coalescer import SAFE_REQUEST_METHODS, RequestCoalescer
+from .fanout import ChatHistory, fetch_histories
+from .log import RequestLogConfig
+from .preprocess import ImagePreprocessor
+from .models import Balance, Chat, Message, RatingInfo, UserInfoSelf
+from .pagination import paginate
+from .rate_limiter import RateLimiter, parse_retry_after
+from .retry import RetryPolicy
+from .session import ConnectionPoolConfig, SessionFactory
+from .schema.auth.models import BaseToken
+from .schema.messenger.methods import (
+    BaseUploadImage,
+    PostWebhook,
+    SendImage,
+    UploadImage,
+    UploadImages,
+)
 from .schema.messenger.models import WebhookSubscriptions
+from .token_store import BaseTokenStore, MemoryTokenStore
+from .upload import ImageSource, content_hash, filename_of
+from .upload_cache import UploadCache
 
 T = TypeVar("T")
 
@@ -44,8 +80,6 @@ class AvitoResponse(AvitoObject, Generic[AvitoType]):
 
 
 class Avito:
-    info_cache = {}
-
     def __init__(
         self,
         token: str | None = None,
@@ -53,13 +87,54 @@ class Avito:
         client_secret: str | None = None,
         session: aiohttp.ClientSession | None = None,
         base_url: str = "https://api.avito.ru",
+        user_id: int | None = None,
+        token_refresh_margin: float | None = 60.0,
+        token_store: BaseTokenStore | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        connection_pool: ConnectionPoolConfig | None = None,
+        session_factory: SessionFactory | None = None,
+        response_cache: ResponseCache | None = None,
+        coalescer: RequestCoalescer | None = None,
+        upload_cache: UploadCache | None = None,
+        image_preprocessor: ImagePreprocessor | None = None,
+        log_config: RequestLogConfig | None = None,
+        trusted_decode: bool = False,
     ):
+        """
+        :param user_id: account id, resolved once with get_self_info when not set
+        :param token_refresh_margin: renew the token in the background this many
+            seconds before it expires, ``None`` disables proactive renewal
+        :param token_store: storage shared between clients of the same ``client_id``,
+            in-memory per client by default
+        :param rate_limiter: limiter shared between clients, by default
+            requests are not limited but 429 responses still pause the endpoint family
+        :param retry_policy: backoff and retry rules for 429, 5xx and network errors
+        :param session: session to use, closed together with the client,
+            cannot be combined with ``session_factory``
+        :param connection_pool: pool settings of the session created by the client
+        :param session_factory: factory shared between clients, not closed by the client
+        :param response_cache: cache of methods with ``__cache_ttl__``, may be
+            shared between clients, see :class:`avito.pool.AvitoPool`
+        :param coalescer: joins identical GET calls in flight, may be shared between clients
+        :param upload_cache: reuse ids of images already uploaded by the account
+        :param image_preprocessor: validate and shrink images before upload,
+            see :mod:`avito.preprocess`
+        :param log_config: request/response logging settings
+        :param trusted_decode: build response models without validation,
+            see :mod:`avito.base.trusted`, can be overridden per call
+        """
+        if session is not None and session_factory is not None:
+            raise ValueError("Pass either session or session_factory, not both")
         self._token = token
         self._client_id = client_id
         self._client_secret = client_secret
-        if session is None:
-            session = aiohttp.ClientSession()
-        self.session = session
+        # session is created lazily inside the running loop
+        self._session = session
+        self._owns_session_factory = session is None and session_factory is None
+        if self._owns_session_factory:
+            session_factory = SessionFactory(connection_pool)
+        self.session_factory = session_factory
         self.base_url = base_url
         self.headers = {
             "Authorization": f"Bearer {self._token}",
@@ -67,97 +142,370 @@ class Avito:
         }
 
         self._me: UserInfoSelf | None = None
-        self.refreshed_token: Token | None = None
+        self._user_id = user_id
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.coalescer = coalescer if coalescer is not None else RequestCoalescer()
+        self.upload_cache = upload_cache
+        self.image_preprocessor = image_preprocessor
+        self.log_config = log_config or RequestLogConfig()
+        self.trusted_decode = trusted_decode
+        self.refreshed_token: BaseToken | None = None
+        self.token_refresh_margin = token_refresh_margin
+        self.token_store = token_store or MemoryTokenStore()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = self.retry_policy.new_budget()
+        self._refresh_future: asyncio.Future[BaseToken] | None = None
+        self._renewal_task: asyncio.Task | None = None
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.session.close()
+        await self.close()
 
-    def make_url(self, method: str) -> str:
-        return f"{self.base_url}/{method}"
+    async def close(self) -> None:
+        self._cancel_renewal()
+        if self.session_factory is None:
+            if self._session is not None:
+                await self._session.close()
+        elif self._owns_session_factory:
+            await self.session_factory.close()
+        self._session = None
 
-    async def _request(self, *args, **kwargs):
-        async with self.session.request(*args, **kwargs) as res:
-            try:
-                body = await res.read()
-                data = orjson.loads(body)
-                logger.debug(
-                    f"Response [{self._client_id}] : {res.status} {pformat(data)}"
-                )
-            except orjson.JSONDecodeError as e:
-                text = await res.text()
-                raise ValueError(f"{e} {text=} {res.status}")
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        return self._session
 
-            except aiohttp.ContentTypeError as e:
-                text = await res.text()
-                raise ValueError(f"{e} {text=}")
+    @property
+    def client_id(self) -> str | None:
+        return self._client_id
 
-            if res.status != 200:
-                if "error" in data:
-                    response = AvitoErrorResponse.model_validate(data)
-                    raise ValueError(f"{response.error.code} {response.error.message}")
+    @property
+    def user_id(self) -> int | None:
+        """Account id pinned by config or :meth:`resolve_user_id`."""
+        return self._user_id
 
-                response = AvitoExpiredTokenResponse.model_validate(data)
-                raise ValueError(f"{response.result.message}")
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self.session_factory is not None:
+            self._session = await self.session_factory.get_session()
+        return self._session
 
-        return data
+    def make_url(self, method: str) -> str:
+        return f"{self.base_url}/{method}"
 
-    async def _actual_call(self, method: AvitoMethod[T]) -> T:
-        url = self.make_url(method.__api_method__)
-        json = method.model_dump(mode="json")
-        content_type = {method.__content_type__: json}
-        logger.debug(
-            f"Request [{self._client_id}]: {url} {pformat(json)} | {method.__request_method__} | {method.__returning__} | {content_type=}"
-        )
-        if isinstance(method, UploadImage):
-            with aiohttp.MultipartWriter("form-data") as form:
-                form.append(
-                    open(method.file_path, "rb"),
-                    {
-                        "Content-Type": "application/octet-stream",
-                        "Content-Disposition": f'form-data; name="uploadfile[]"; filename="{method.file_path}"',
-                    },
-                )
-                data = await self._request(
-                    method.__request_method__,
-                    url,
-                    headers=self.headers,
-                    data=form,
-                )
+    async def _request(self, *args, **kwargs):
+        session = await self.get_session()
+        try:
+            async with session.request(*args, **kwargs) as res:
+                if res.status == 429:
+                    raise TooManyRequestsError(
+                        f"429 Too Many Requests {res.url}",
+                        retry_after=parse_retry_after(res.headers.get("Retry-After")),
+                    )
+                body = await res.read()
+                if res.status == 200:
+                    # decoded straight into the returning model by _actual_call
+                    return body
+                try:
+                    data = orjson.loads(body)
+                except orjson.JSONDecodeError as e:
+                    text = body.decode(errors="replace")
+                    if res.status >= 500:
+                        raise ServerError(f"{res.status} {text}", status=res.status)
+                    raise BadResponseError(f"{e} {text=} {res.status}", status=res.status)
+                raise self._make_error(res.status, data)
+        except aiohttp.ClientConnectorError as e:
+            raise NetworkError(str(e), sent=False) from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise NetworkError(f"{type(e).__name__}: {e}", sent=True) from e
+
+    @staticmethod
+    def _make_error(status: int, data: dict) -> AvitoAPIError:
+        code = None
+        if isinstance(data, dict) and "error" in data:
+            response = AvitoErrorResponse.model_validate(data)
+            message = f"{response.error.code} {response.error.message}"
+            code = response.error.code
+        elif isinstance(data, dict) and "result" in data:
+            response = AvitoExpiredTokenResponse.model_validate(data)
+            message = f"{response.result.message}"
+        else:
+            message = f"{status} {data}"
+
+        if (
+            status == 401
+            or "access token expired" in message
+            or message.startswith("unauthorized_")
+            or "invalid access token" in message
+        ):
+            error_type = UnauthorizedError
+        elif status >= 500:
+            error_type = ServerError
         else:
-            data = await self._request(
+            error_type = AvitoAPIError
+        return error_type(message, status=status, code=code)
+
+    async def _send(self, method: AvitoMethod[T], url: str, payload: dict):
+        if isinstance(method, BaseUploadImage):
+            # built per attempt, file sources are reopened and streamed again
+            return await self._request(
                 method.__request_method__,
                 url,
                 headers=self.headers,
-                **content_type,
+                data=method.make_form(),
+            )
+        return await self._request(
+            method.__request_method__,
+            url,
+            headers=self.headers,
+            **{method.__content_type__: payload},
+        )
+
+    async def _actual_call(
+        self,
+        method: AvitoMethod[T],
+        trusted: bool = False,
+        projection: frozenset[str] | None = None,
+    ) -> T:
+        api_method = method.__api_method__
+        cache_ttl = method.__cache_ttl__
+        if cache_ttl is not None:
+            body = self.response_cache.get(self._client_id, api_method)
+            if body is not None:
+                logger.debug("Cache hit [{}]: {}", self._client_id, api_method)
+                return self._decode(method, body, trusted, projection)
+        url = self.make_url(api_method)
+        json = method.model_dump(mode="json")
+        log_config = self.log_config
+        log_bodies = log_config.sample()
+        # formatting is deferred by loguru until a handler accepts the level
+        logger.log(
+            log_config.level,
+            "Request [{}]: {} {} {}",
+            self._client_id,
+            method.__request_method__,
+            url,
+            log_config.body(json, log_bodies),
+        )
+        started = time.perf_counter()
+        family = self.rate_limiter.family_of(api_method)
+        waited = await self.rate_limiter.acquire(self._client_id, family)
+        if waited:
+            logger.debug(f"Rate limited [{self._client_id}] {family}: waited {waited:.3f}s")
+        try:
+            body = await self._send(method, url, json)
+        except AvitoError as e:
+            e.method = method
+            if isinstance(e, TooManyRequestsError):
+                self.rate_limiter.pause(self._client_id, family, e.retry_after)
+            raise
+        logger.log(
+            log_config.level,
+            "Response [{}]: {} {} 200 {:.1f}ms {}",
+            self._client_id,
+            method.__request_method__,
+            url,
+            (time.perf_counter() - started) * 1000,
+            log_config.body(body, log_bodies),
+        )
+        result = self._decode(method, body, trusted, projection)
+        for stale in method.__invalidates__:
+            self.response_cache.invalidate(self._client_id, stale)
+        if cache_ttl is not None:
+            self.response_cache.set(self._client_id, api_method, body, cache_ttl)
+        return result
+
+    def _decode(
+        self,
+        method: AvitoMethod[T],
+        body: bytes,
+        trusted: bool,
+        projection: frozenset[str] | None,
+    ) -> T:
+        try:
+            result = method.decode_response(
+                body,
+                context={"avito": self},
+                trusted=trusted,
+                projection=projection,
             )
-        # response_type = AvitoResponse[method.__returning__]
-        # response = response_type(result=data)
-        # return response.result
-        if method.__returning__ is dict:
-            return data
-        return method.__returning__.model_validate(data, context={"avito": self})
-
-    async def __call__(self, method: AvitoMethod[T]) -> T:
+        except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                raise BadResponseError(f"{e} {body=}", status=200, method=method) from e
+            raise
+        except orjson.JSONDecodeError as e:
+            # raw dict decoders parse with orjson directly
+            raise BadResponseError(f"{e} {body=}", status=200, method=method) from e
+        if projection is not None:
+            # projected objects have no helpers to bind
+            return result
+        return method.bind_response(result)
+
+    async def __call__(
+        self,
+        method: AvitoMethod[T],
+        trusted: bool | None = None,
+        projection: Iterable[str] | None = None,
+    ) -> T:
+        """
+        Call the method.
+
+        Identical GET calls in flight are joined into one request
+        and their callers get the same result object.
+
+        :param trusted: build response without validation, defaults to ``trusted_decode``
+        :param projection: decode only these dotted field paths of the response
+            into light read-only objects, see :mod:`avito.base.projection`
+        """
         if not self._token:
             logger.info("Token is not set, trying to init token")
             await self.init_token_if_needed()
+        elif self.refreshed_token and self.refreshed_token.is_expired():
+            # background renewal did not make it in time (e.g. the loop was blocked)
+            await self._refresh_token_once(self._token)
+
+        if trusted is None:
+            trusted = self.trusted_decode
+        if projection is not None:
+            projection = as_projection(projection)
+        if method.__request_method__ in SAFE_REQUEST_METHODS:
+            key = (
+                self._client_id,
+                method.__request_method__,
+                method.__api_method__,
+                trusted,
+                projection,
+            )
+            return await self.coalescer.run(
+                key, lambda: self._call(method, trusted, projection)
+            )
+        return await self._call(method, trusted, projection)
+
+    async def _call(
+        self,
+        method: AvitoMethod[T],
+        trusted: bool,
+        projection: frozenset[str] | None,
+    ) -> T:
+        self.retry_budget.deposit()
+        attempt = 0
+        token_refreshed = False
+        while True:
+            token = self._token
+            try:
+                return await self._actual_call(method, trusted, projection)
+            except UnauthorizedError as e:
+                logger.warning(f"Error: {e}")
+                if token_refreshed:
+                    raise
+                token_refreshed = True
+                await self._refresh_token_once(token)
+            except AvitoError as e:
+                logger.warning(f"Error: {e}")
+                attempt += 1
+                if not self.retry_policy.should_retry(
+                    method, e, attempt, self.retry_budget
+                ):
+                    raise
+                delay = self.retry_policy.get_delay(attempt, e)
+                logger.info(
+                    f"Retry [{self._client_id}] {type(method).__name__} "
+                    f"attempt {attempt + 1} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _refresh_token_once(self, stale_token: str | None) -> BaseToken | None:
+        """
+        Refresh token at most once for all concurrent callers.
+
+        :param stale_token: token the failed request was sent with
+        :return: refreshed token
+        """
+        if self._token != stale_token:
+            # someone has already refreshed the token while we were waiting
+            return self.refreshed_token
+        if self._refresh_future is None:
+            self._refresh_future = asyncio.ensure_future(
+                self._refresh_shared_token(stale_token)
+            )
+            self._refresh_future.add_done_callback(self._on_refresh_done)
+        return await asyncio.shield(self._refresh_future)
+
+    async def _refresh_shared_token(self, stale_token: str | None) -> BaseToken:
+        # lock-free fast path for cold start with a warm store
+        if token := await self._adopt_stored_token(stale_token):
+            return token
+        async with self.token_store.lock(self._client_id):
+            if token := await self._adopt_stored_token(stale_token):
+                return token
+            return await self.refresh_token()
+
+    async def _adopt_stored_token(self, stale_token: str | None) -> BaseToken | None:
+        stored = await self.token_store.get(self._client_id)
+        if (
+            stored is None
+            or stored.access_token == stale_token
+            # a token about to be renewed is not worth adopting
+            or stored.is_expired(self.token_refresh_margin or .0)
+        ):
+            return None
+        logger.debug(f"Using token from store [{self._client_id}]")
+        self.set_token(stored)
+        return stored
+
+    def _on_refresh_done(self, _: asyncio.Future[BaseToken]) -> None:
+        self._refresh_future = None
+
+    def _schedule_renewal(self, token: BaseToken) -> None:
+        self._cancel_renewal()
+        if self.token_refresh_margin is None:
+            return
         try:
-            return await self._actual_call(method)
-        except ValueError as e:
-            logger.warning(f"Error: {e}")
-            if "access token expired" in str(e):
-                self.refreshed_token = await self.refresh_token()
-                return await self._actual_call(method)
-            if str(e).startswith("unauthorized_"):
-                self.refreshed_token = await self.refresh_token()
-                return await self._actual_call(method)
-            if "invalid access token" in str(e):
-                self.refreshed_token = await self.refresh_token()
-                return await self._actual_call(method)
-            raise e
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no loop yet, the hot path falls back to is_expired() check
+            return
+        self._renewal_task = loop.create_task(self._renew_token_later(token))
+
+    def _cancel_renewal(self) -> None:
+        if self._renewal_task and self._renewal_task is not asyncio.current_task():
+            self._renewal_task.cancel()
+        self._renewal_task = None
+
+    async def _renew_token_later(self, token: BaseToken) -> None:
+        ttl = token.expires_at - time.time()
+        # short-lived tokens are renewed at half of their lifetime
+        await asyncio.sleep(max(ttl - self.token_refresh_margin, ttl / 2, 0))
+        while self._token == token.access_token and not token.is_expired():
+            try:
+                await self._refresh_token_once(token.access_token)
+                return
+            except Exception as e:
+                logger.warning(f"Token renewal failed [{self._client_id}]: {e}")
+                await asyncio.sleep(min(5.0, max(token.expires_at - time.time(), 0)))
+
+    def parse(
+        self,
+        returning: type[AvitoObject],
+        data: bytes | str | dict,
+        trusted: bool | None = None,
+    ) -> AvitoObject:
+        """
+        Build model bound to this client from json, e.g. an archived response
+        or a webhook body.
+
+        :param trusted: skip validation, defaults to ``trusted_decode``
+        """
+        if trusted is None:
+            trusted = self.trusted_decode
+        if trusted:
+            if not isinstance(data, dict):
+                data = orjson.loads(data)
+            return construct(returning, data, self)
+        if isinstance(data, dict):
+            return returning.model_validate(data, context={"avito": self})
+        return returning.model_validate_json(data, context={"avito": self})
 
     @property
     def token(self):
@@ -170,45 +518,189 @@ class Avito:
             "Authorization": f"Bearer {self._token}",
         }
 
-    async def refresh_token(self) -> Token:
-        get_token = GetToken(
-            client_id=self._client_id,
-            client_secret=self._client_secret,
-        ).as_(self)
-        token = await get_token
+    def set_token(self, token: BaseToken) -> None:
+        """
+        Use token object obtained elsewhere (e.g. via GetTokenOAuth)
+        and keep it renewed before it expires.
+
+        :param token: Token or OAuthToken
+        """
         self.token = token.access_token
+        self.refreshed_token = token
+        self._schedule_renewal(token)
+
+    async def refresh_token(self) -> BaseToken:
+        if self.refreshed_token is not None:
+            # OAuthToken renews via refresh_token grant, Token via client credentials
+            get_token = self.refreshed_token.refresh(
+                client_id=self._client_id,
+                client_secret=self._client_secret,
+            ).as_(self)
+        else:
+            get_token = GetToken(
+                client_id=self._client_id,
+                client_secret=self._client_secret,
+            ).as_(self)
+        # bypass __call__ so that a failing token request never waits on itself
+        token = await self._actual_call(get_token)
+        self.set_token(token)
+        await self.token_store.set(self._client_id, token)
         return token
 
-    async def init_token_if_needed(self) -> Token | None:
+    async def init_token_if_needed(self) -> BaseToken | None:
         if self.token:
             return None
-        get_token = GetToken(
-            client_id=self._client_id,
-            client_secret=self._client_secret,
-        ).as_(self)
-        token = await self._actual_call(get_token)
-        self.token = token.access_token
-        return token
+        return await self._refresh_token_once(None)
 
     async def get_self_info(self) -> UserInfoSelf:
         if self._me:
-            logger.debug(f"Using cached self info _me: {self._me}")
+            logger.debug("Using cached self info _me: {}", self._me)
             return self._me
-        if info := self.info_cache.get(self._client_id):
-            logger.debug(f"Using cached self info info_cache: {info}")
-            self._me = info
-        else:
-            call = GetUserInfoSelf()
-            self._me = await self(call)
-            self.info_cache[self._client_id] = self._me
+        # served from response_cache when another client of the account asked
+        call = GetUserInfoSelf()
+        self._me = await self(call)
+        if self._user_id is None:
+            self._user_id = self._me.id
         return self._me
 
+    async def resolve_user_id(self) -> int:
+        """
+        Account id, requested at most once per client.
+
+        Concurrent first calls share one GetUserInfoSelf request.
+        """
+        if self._user_id is None:
+            await self.get_self_info()
+        return self._user_id
+
+    async def iter_chats(
+        self,
+        item_ids: list[int] | None = None,
+        unread_only: bool | None = None,
+        chat_types: str | None = None,
+        page_size: int = 100,
+        user_id: int | None = None,
+        projection: Iterable[str] | None = None,
+    ) -> AsyncIterator[Chat]:
+        """
+        Iterate all chats of the account page by page, prefetching the next page.
+
+        :param page_size: chats per request, at most 100
+        :param user_id: account id, :meth:`resolve_user_id` by default
+        :param projection: decode only these fields of a chat, e.g.
+            ``{"id", "updated", "last_message.created", "users.id"}``
+        """
+        page_projection = prefixed("chats", projection)
+        if user_id is None:
+            user_id = await self.resolve_user_id()
+
+        async def fetch_page(offset: int, limit: int):
+            call = GetChats(
+                user_id=user_id,
+                item_ids=item_ids,
+                unread_only=unread_only,
+                chat_types=chat_types,
+                limit=limit,
+                offset=offset,
+            )
+            return await self(call, projection=page_projection)
+
+        async for chat in paginate(
+            fetch_page,
+            get_items=lambda page: page.chats,
+            has_more=lambda page, items: len(items) >= page_size,
+            page_size=page_size,
+        ):
+            yield chat
+
+    async def iter_messages(
+        self,
+        chat_id: str,
+        page_size: int = 100,
+        user_id: int | None = None,
+        projection: Iterable[str] | None = None,
+    ) -> AsyncIterator[Message]:
+        """
+        Iterate all messages of the chat page by page, prefetching the next page.
+
+        :param page_size: messages per request, at most 100
+        :param user_id: account id, :meth:`resolve_user_id` by default
+        :param projection: decode only these fields of a message
+        """
+        page_projection = prefixed("messages", projection)
+        if page_projection is not None:
+            page_projection |= {"meta"}
+        if user_id is None:
+            user_id = await self.resolve_user_id()
+
+        async def fetch_page(offset: int, limit: int):
+            call = GetMessages(
+                user_id=user_id,
+                chat_id=chat_id,
+                limit=limit,
+                offset=offset,
+            )
+            return await self(call, projection=page_projection)
+
+        async for message in paginate(
+            fetch_page,
+            get_items=lambda page: page.messages,
+            has_more=lambda page, items: page.meta.has_more,
+            page_size=page_size,
+        ):
+            yield message
+
+    def fetch_histories(
+        self,
+        concurrency: int = 4,
+        max_pages: int | None = 1,
+        page_size: int = 100,
+        **chat_filters,
+    ) -> AsyncIterator[ChatHistory]:
+        """
+        Fetch messages of every chat of the account concurrently,
+        see :func:`avito.fanout.fetch_histories`.
+        """
+        return fetch_histories(
+            self.iter_chats(**chat_filters),
+            concurrency=concurrency,
+            per_account=concurrency,
+            max_pages=max_pages,
+            page_size=page_size,
+        )
+
+    def broadcast(
+        self,
+        chat_ids: Iterable[str] | AsyncIterable[str],
+        text: str | None = None,
+        image: ImageSource | None = None,
+        concurrency: int = 10,
+        checkpoint: str | os.PathLike | None = None,
+    ) -> AsyncIterator[BroadcastResult]:
+        """
+        Send a text or an image to many chats, see :func:`avito.broadcast.broadcast`.
+
+        Usage::
+
+            async for result in avito.broadcast(chat_ids, text="Sale!", checkpoint="sale.txt"):
+                if not result.ok:
+                    logger.warning(f"{result.chat_id}: {result.error}")
+        """
+        return broadcast(
+            self,
+            chat_ids,
+            text=text,
+            image=image,
+            concurrency=concurrency,
+            checkpoint=checkpoint,
+        )
+
     async def get_self_rating(self) -> RatingInfo:
         call = GetRatingsInfo()
         return await self(call)
 
     async def get_self_balance(self) -> Balance:
-        return await self.get_balance(self._me.id)
+        return await self.get_balance(await self.resolve_user_id())
 
     async def get_balance(self, user_id: int) -> Balance:
         call = GetUserBalance(user_id=user_id)
@@ -232,29 +724,143 @@ class Avito:
 
     async def upload_image(
         self,
-        file_path: str,
+        file_path: ImageSource,
+        filename: str | None = None,
+        user_id: int | None = None,
     ) -> str:
-        from .schema.messenger.methods import UploadImage
-
-        me = await self.get_self_info()
-        call = UploadImage(user_id=me.id, file_path=file_path)
+        """
+        :param file_path: path, bytes-like or async stream of bytes
+        :param user_id: account id, :meth:`resolve_user_id` by default
+        :return: image id, reused from ``upload_cache`` for known content
+        """
+        if self.upload_cache is not None:
+            digest = await content_hash(file_path)
+            if digest is not None:
+                return await self.upload_cache.get_or_upload(
+                    self._client_id,
+                    digest,
+                    lambda: self._upload_image(file_path, filename, user_id),
+                )
+        return await self._upload_image(file_path, filename, user_id)
+
+    async def _preprocess(
+        self, image: ImageSource, filename: str | None, index: int = 0
+    ) -> tuple[ImageSource, str | None]:
+        if self.image_preprocessor is None:
+            return image, filename
+        processed = await self.image_preprocessor.process(image)
+        if processed is not image and filename is None:
+            # keep the name of the original file
+            filename = filename_of(image, index)
+        return processed, filename
+
+    async def _upload_image(
+        self,
+        file_path: ImageSource,
+        filename: str | None,
+        user_id: int | None,
+    ) -> str:
+        file_path, filename = await self._preprocess(file_path, filename)
+        if user_id is None:
+            user_id = await self.resolve_user_id()
+        call = UploadImage(user_id=user_id, file_path=file_path, filename=filename)
         res = await self(call)
-        if isinstance(res, dict):
+        if isinstance(res, dict) and res:
             # first key is image_id
-            image_id = list(res.keys())[0]
+            image_id = next(iter(res))
             return image_id
         raise ValueError("Failed to upload image")
 
+    async def upload_images(
+        self,
+        images: list[ImageSource],
+        filenames: list[str] | None = None,
+    ) -> list[str]:
+        """
+        Upload several images in a single request.
+
+        Images found in ``upload_cache`` are not uploaded.
+
+        :param images: paths, bytes-like or async streams of bytes
+        :return: image ids in the order of ``images``
+        """
+        image_ids: list[str | None] = [None] * len(images)
+        digests: list[str | None] = [None] * len(images)
+        if self.upload_cache is not None:
+            digests = list(await asyncio.gather(*map(content_hash, images)))
+            for index, digest in enumerate(digests):
+                if digest is not None:
+                    image_ids[index] = await self.upload_cache.get(self._client_id, digest)
+        missing = [index for index, image_id in enumerate(image_ids) if image_id is None]
+        if missing:
+            prepared = await asyncio.gather(
+                *(
+                    self._preprocess(
+                        images[index], filenames[index] if filenames else None, index
+                    )
+                    for index in missing
+                )
+            )
+            call = UploadImages(
+                user_id=await self.resolve_user_id(),
+                images=[image for image, _ in prepared],
+                names=[
+                    name or filename_of(images[index], index)
+                    for index, (_, name) in zip(missing, prepared)
+                ],
+            )
+            res = await self(call)
+            if not isinstance(res, dict) or len(res) != len(missing):
+                raise ValueError(f"Failed to upload images: {res}")
+            for index, image_id in zip(missing, res):
+                image_ids[index] = image_id
+                if digests[index] is not None:
+                    await self.upload_cache.set(self._client_id, digests[index], image_id)
+        return image_ids
+
     async def send_image(
         self,
         chat_id: str,
-        file_path: str,
-    ) -> dict:
-        image_id = await self.upload_image(file_path=file_path)
-        me = await self.get_self_info()
+        file_path: ImageSource,
+    ) -> Message:
+        user_id = await self.resolve_user_id()
+        image_id = await self.upload_image(file_path=file_path, user_id=user_id)
         call = SendImage(
-            user_id=me.id,
+            user_id=user_id,
             chat_id=chat_id,
             image_id=image_id,
         )
         return await self(call)
+
+    async def send_images(
+        self,
+        chat_id: str,
+        images: list[ImageSource],
+        concurrency: int = 4,
+    ) -> list[Message]:
+        """
+        Send images to the chat in order.
+
+        Uploads run ahead of the sends, so the next images are uploading
+        while the previous ones are being sent.
+
+        :param concurrency: uploads in flight
+        """
+        user_id = await self.resolve_user_id()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(image: ImageSource) -> str:
+            async with semaphore:
+                return await self.upload_image(image, user_id=user_id)
+
+        uploads = [asyncio.ensure_future(upload(image)) for image in images]
+        messages: list[Message] = []
+        try:
+            for upload_task in uploads:
+                call = SendImage(user_id=user_id, chat_id=chat_id, image_id=await upload_task)
+                messages.append(await self(call))
+        finally:
+            for upload_task in uploads:
+                upload_task.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
+        return messages
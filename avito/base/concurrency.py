@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+_SOURCE_FAILED = object()
+
+
+async def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    concurrency: int = 10,
+) -> AsyncIterator[tuple[T, R | BaseException]]:
+    """
+    Run ``func`` for every item with at most ``concurrency`` calls in flight
+    and yield ``(item, result)`` pairs as they complete.
+
+    Errors do not stop the run, they are yielded in place of the result.
+    Items are pulled lazily, so memory stays bounded for long inputs.
+    Leaving the iteration early cancels the calls in flight.
+    """
+    if isinstance(items, AsyncIterable):
+        source = aiter(items)
+    else:
+        source = _as_async_iterator(items)
+    source_lock = asyncio.Lock()
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def worker():
+        while True:
+            async with source_lock:
+                try:
+                    item = await anext(source)
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    await results.put((_SOURCE_FAILED, e))
+                    break
+            try:
+                result = await func(item)
+            except Exception as e:
+                result = e
+            await results.put((item, result))
+        await results.put(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            entry = await results.get()
+            if entry is _DONE:
+                running -= 1
+                continue
+            if entry[0] is _SOURCE_FAILED:
+                raise entry[1]
+            yield entry
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _as_async_iterator(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
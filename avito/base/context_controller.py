@@ -6,6 +6,8 @@ from typing import Any, Optional
 from pydantic import BaseModel, PrivateAttr
 from typing_extensions import Self
 
+from avito.exceptions import AvitoError
+
 if typing.TYPE_CHECKING:
     from avito.avito import Avito
 
@@ -38,5 +40,16 @@ class BotContextController(BaseModel):
         return self._avito
 
     @property
-    def me_id(self)-> Optional[int]:
-        return self._avito._me.id if self._avito else None
+    def me_id(self) -> int:
+        """
+        Account id pinned by the client, see :meth:`Avito.resolve_user_id`.
+
+        :raise AvitoError: the id is not known yet
+        """
+        user_id = self._avito.user_id if self._avito else None
+        if user_id is None:
+            raise AvitoError(
+                "Account id is unknown: pass user_id= to Avito "
+                "or await avito.resolve_user_id() first"
+            )
+        return user_id
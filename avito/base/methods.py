@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import abc
 import typing
-from typing import Generic, TypeVar
+from typing import Any, Callable, Generic, TypeVar
 
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, TypeAdapter
 
+from avito.base import trusted
 from avito.base.context_controller import BotContextController
+from avito.base.projection import Projection, as_projection, projection_model
 
 if typing.TYPE_CHECKING:
     from avito.avito import Avito
@@ -14,10 +17,18 @@ if typing.TYPE_CHECKING:
 
 AvitoType = TypeVar("AvitoType")
 
+_response_decoders: dict[
+    tuple[type, bool, Projection | None], Callable[[bytes, dict], Any]
+] = {}
+
 
 class AvitoMethod(BotContextController, BaseModel, Generic[AvitoType], abc.ABC):
     __request_method__ = "POST"
     __content_type__ = "data"
+    # None means derive from __request_method__, see avito.retry.is_idempotent
+    __idempotent__: typing.ClassVar[bool | None] = None
+    # seconds to keep the response in Avito.response_cache, None disables caching
+    __cache_ttl__: typing.ClassVar[float | None] = None
 
     @property
     @abc.abstractmethod
@@ -29,6 +40,41 @@ class AvitoMethod(BotContextController, BaseModel, Generic[AvitoType], abc.ABC):
     def __api_method__(self) -> str:
         pass
 
+    @property
+    def __invalidates__(self) -> tuple[str, ...]:
+        """API methods whose cached responses are stale after this call."""
+        return ()
+
+    @classmethod
+    def decode_response(
+        cls,
+        body: bytes,
+        context: dict | None = None,
+        trusted: bool = False,
+        projection: Projection | None = None,
+    ) -> AvitoType:
+        """
+        Validate raw response body into ``__returning__`` in a single pass.
+
+        Validator is built once per method class.
+
+        :param trusted: skip validation, see :mod:`avito.base.trusted`
+        :param projection: decode only these fields, see :mod:`avito.base.projection`
+        """
+        if projection is not None:
+            projection = as_projection(projection)
+        key = (cls, trusted, projection)
+        decoder = _response_decoders.get(key)
+        if decoder is None:
+            decoder = _response_decoders[key] = _make_decoder(
+                cls.__returning__, trusted, projection
+            )
+        return decoder(body, context)
+
+    def bind_response(self, response: AvitoType) -> AvitoType:
+        """Pass request data the response helpers need, e.g. the account id."""
+        return response
+
     async def emit(self, avito: Avito) -> AvitoType:
         return await avito(self)
 
@@ -47,3 +93,22 @@ class AvitoMethod(BotContextController, BaseModel, Generic[AvitoType], abc.ABC):
                 "and then call it `await method()`"
             )
         return self.emit(avito).__await__()
+
+
+def _make_decoder(
+    returning: Any,
+    trusted_: bool,
+    projection: Projection | None,
+) -> Callable[[bytes, dict | None], Any]:
+    if returning is dict:
+        return lambda body, context: orjson.loads(body)
+    if projection is not None:
+        # projected objects are light and never bound to a client
+        adapter = TypeAdapter(projection_model(returning, projection))
+        return lambda body, context: adapter.validate_json(body)
+    if trusted_:
+        return lambda body, context: trusted.construct(
+            returning, orjson.loads(body), (context or {}).get("avito")
+        )
+    adapter = TypeAdapter(returning)
+    return lambda body, context: adapter.validate_json(body, context=context)
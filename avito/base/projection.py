@@ -0,0 +1,111 @@
+"""
+Decoding only selected fields of a response.
+
+A projection is a set of dotted field paths relative to the returned model,
+e.g. ``{"chats.id", "chats.updated", "chats.last_message.created", "chats.users.id"}``.
+Lists are traversed transparently. Only the listed fields are validated into
+light objects, the rest of the payload is skipped by the json parser.
+A path ending on a nested model keeps that model whole.
+"""
+from __future__ import annotations
+
+import types
+import typing
+from typing import Any, Iterable, Union
+
+from pydantic import BaseModel, ConfigDict, create_model
+from pydantic.fields import FieldInfo
+
+Projection = frozenset[str]
+
+_models: dict[tuple[type[BaseModel], Projection], type[BaseModel]] = {}
+
+
+class ProjectedObject(BaseModel):
+    """Base of projection models, read-only and not bound to a client."""
+
+    model_config = ConfigDict(extra="ignore", frozen=True, populate_by_name=True)
+
+
+def as_projection(paths: Iterable[str]) -> Projection:
+    if isinstance(paths, str):
+        paths = (paths,)
+    return frozenset(paths)
+
+
+def prefixed(prefix: str, paths: Iterable[str] | None) -> Projection | None:
+    """Make item level paths relative to a page, e.g. ``id`` to ``chats.id``."""
+    if paths is None:
+        return None
+    return frozenset(f"{prefix}.{path}" for path in as_projection(paths))
+
+
+def projection_model(model: type[BaseModel], paths: Iterable[str]) -> type[BaseModel]:
+    """
+    Model with only ``paths`` fields of ``model``, cached per projection.
+    """
+    projection = as_projection(paths)
+    key = (model, projection)
+    projected = _models.get(key)
+    if projected is None:
+        projected = _models[key] = _build(model, _tree(projection))
+    return projected
+
+
+def _tree(paths: Projection) -> dict[str, dict]:
+    tree: dict[str, dict] = {}
+    for path in paths:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _build(model: type[BaseModel], tree: dict[str, dict]) -> type[BaseModel]:
+    fields: dict[str, Any] = {}
+    for name, subtree in tree.items():
+        field = model.model_fields.get(name)
+        if field is None:
+            raise ValueError(f"{model.__name__} has no field {name!r}")
+        annotation = field.annotation
+        if subtree:
+            nested = _nested_model(annotation)
+            if nested is None:
+                raise ValueError(f"{model.__name__}.{name} has no nested fields")
+            annotation = _replace(annotation, nested, _build(nested, subtree))
+        info = FieldInfo(annotation=annotation, alias=field.alias)
+        if not field.is_required():
+            info.default = field.default
+            info.default_factory = field.default_factory
+        fields[name] = (annotation, info)
+    return create_model(
+        f"{model.__name__}Projection",
+        __base__=ProjectedObject,
+        **fields,
+    )
+
+
+def _is_union(annotation: Any) -> bool:
+    origin = typing.get_origin(annotation)
+    return origin is Union or origin is types.UnionType
+
+
+def _nested_model(annotation: Any) -> type[BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        if nested := _nested_model(arg):
+            return nested
+    return None
+
+
+def _replace(annotation: Any, old: type[BaseModel], new: type[BaseModel]) -> Any:
+    if annotation is old:
+        return new
+    args = typing.get_args(annotation)
+    if not args:
+        return annotation
+    replaced = tuple(_replace(arg, old, new) for arg in args)
+    if _is_union(annotation):
+        return Union[replaced]
+    return typing.get_origin(annotation)[replaced]
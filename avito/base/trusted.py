@@ -0,0 +1,124 @@
+"""
+Building models from trusted data without validation.
+
+Used to replay archived responses or bulk-load history, where running
+full validation on every ``HttpUrl`` is pure overhead. Values are taken as is:
+URLs stay plain strings and nothing is type checked. Only nested models,
+lists of models and enums are converted, so helpers like ``answer()`` keep
+working and ``type`` fields still compare with enum members.
+
+Because URLs are not converted to ``HttpUrl``, ``model_dump()`` of such objects
+emits serializer warnings, pass ``warnings=False`` to silence them.
+"""
+from __future__ import annotations
+
+import types
+import typing
+from enum import Enum
+from typing import Any, Callable, Union
+
+from pydantic import BaseModel
+
+_Converter = Callable[[Any, Any], Any]
+_builders: dict[type[BaseModel], Callable[[dict, Any], BaseModel]] = {}
+_MISSING = object()
+
+
+def construct(model: type[BaseModel], data: dict, avito: Any = None) -> BaseModel:
+    """
+    Build ``model`` from ``data`` without validation and bind it to ``avito``.
+
+    :param model: pydantic model class
+    :param data: decoded json of the model, keys are field aliases
+    :param avito: Avito instance to bind the object and nested objects to
+    """
+    builder = _builders.get(model)
+    if builder is None:
+        builder = _builders[model] = _make_builder(model)
+    return builder(data, avito)
+
+
+def _make_builder(model: type[BaseModel]) -> Callable[[dict, Any], BaseModel]:
+    """
+    Generate a straight-line builder function for ``model``,
+    a loop over fields costs more than the assignments themselves.
+    """
+    namespace: dict[str, Any] = {
+        "_MISSING": _MISSING,
+        "_new": object.__new__,
+        "_setattr": object.__setattr__,
+        "_model": model,
+    }
+    lines = [
+        "def build(data, avito):",
+        "    get = data.get",
+        "    fields_set = set()",
+        "    add = fields_set.add",
+    ]
+    names = []
+    for index, (name, field) in enumerate(model.model_fields.items()):
+        key = field.alias or name
+        if field.is_required():
+            default = "None"
+        elif field.default_factory is not None:
+            namespace[f"_factory_{index}"] = field.default_factory
+            default = f"_factory_{index}()"
+        else:
+            namespace[f"_default_{index}"] = field.default
+            default = f"_default_{index}"
+        lines += [
+            f"    v{index} = get({key!r}, _MISSING)",
+            f"    if v{index} is _MISSING:",
+            f"        v{index} = {default}",
+            "    else:",
+            f"        add({name!r})",
+        ]
+        converter = _make_converter(field.annotation)
+        if converter is not None:
+            namespace[f"_convert_{index}"] = converter
+            lines += [
+                f"        if v{index} is not None:",
+                f"            v{index} = _convert_{index}(v{index}, avito)",
+            ]
+        names.append(f"{name!r}: v{index}")
+    private = ", ".join(
+        f"{name!r}: {'avito' if name == '_avito' else 'None'}"
+        for name in model.__private_attributes__
+    )
+    lines += [
+        "    obj = _new(_model)",
+        f"    _setattr(obj, '__dict__', {{{', '.join(names)}}})",
+        "    _setattr(obj, '__pydantic_fields_set__', fields_set)",
+        "    _setattr(obj, '__pydantic_extra__', None)",
+        f"    _setattr(obj, '__pydantic_private__', {{{private}}})",
+        "    return obj",
+    ]
+    exec("\n".join(lines), namespace)
+    return namespace["build"]
+
+
+def _make_converter(annotation: Any) -> _Converter | None:
+    origin = typing.get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        converters = [
+            _make_converter(arg)
+            for arg in typing.get_args(annotation)
+            if arg is not type(None)
+        ]
+        converters = [converter for converter in converters if converter is not None]
+        # unions of several models are rare in the schema, take the first one
+        return converters[0] if converters else None
+    if origin in (list, tuple, set, frozenset):
+        args = typing.get_args(annotation)
+        item_converter = _make_converter(args[0]) if args else None
+        if item_converter is None:
+            return None
+        return lambda value, avito: [item_converter(item, avito) for item in value]
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return lambda value, avito: construct(annotation, value, avito)
+        if issubclass(annotation, Enum):
+            # unknown values are kept as is instead of raising
+            members = annotation._value2member_map_
+            return lambda value, avito: members.get(value, value)
+    return None
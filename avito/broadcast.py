@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import typing
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+import aiofiles
+
+from .base.concurrency import bounded_map
+from .methods import SendImage, SendMessage
+from .models import MessageToSend
+
+if typing.TYPE_CHECKING:
+    from .avito import Avito
+    from .models import Message
+    from .upload import ImageSource
+
+
+@dataclass(slots=True)
+class BroadcastResult:
+    """Outcome of sending to one chat, ``error`` is set when the send failed."""
+
+    chat_id: str
+    message: Message | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BroadcastCheckpoint:
+    """
+    Append-only file of chat ids that were sent to.
+
+    A restarted broadcast with the same checkpoint skips them,
+    failed chats are not recorded and are tried again.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> set[str]:
+        try:
+            async with aiofiles.open(self.path) as file:
+                return {line.strip() async for line in file if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    async def add(self, chat_id: str) -> None:
+        async with self._lock:
+            async with aiofiles.open(self.path, "a") as file:
+                await file.write(f"{chat_id}\n")
+
+
+async def _pending(
+    chat_ids: Iterable[str] | AsyncIterable[str], done: set[str]
+) -> AsyncIterator[str]:
+    if isinstance(chat_ids, AsyncIterable):
+        async for chat_id in chat_ids:
+            if chat_id not in done:
+                yield chat_id
+    else:
+        for chat_id in chat_ids:
+            if chat_id not in done:
+                yield chat_id
+
+
+async def broadcast(
+    avito: Avito,
+    chat_ids: Iterable[str] | AsyncIterable[str],
+    text: str | None = None,
+    image: ImageSource | None = None,
+    concurrency: int = 10,
+    checkpoint: str | os.PathLike | None = None,
+) -> AsyncIterator[BroadcastResult]:
+    """
+    Send one text or image to many chats and yield results as they complete.
+
+    The image is uploaded once and its id is reused for every chat.
+    Sends go through the client, so its rate limiter and retry policy apply,
+    and a failed chat does not stop the run. Chats in flight when the process
+    stops may be sent to again on resume.
+
+    :param chat_ids: chats to send to, pulled lazily
+    :param concurrency: sends in flight
+    :param checkpoint: file of finished chats to resume an interrupted broadcast
+    """
+    if (text is None) == (image is None):
+        raise ValueError("Exactly one of text and image is required")
+    user_id = await avito.resolve_user_id()
+    store = BroadcastCheckpoint(checkpoint) if checkpoint is not None else None
+    done = await store.load() if store is not None else set()
+
+    if text is not None:
+        message = MessageToSend(text=text)
+
+        def make_call(chat_id: str) -> SendMessage | SendImage:
+            return SendMessage(user_id=user_id, chat_id=chat_id, message=message)
+    else:
+        image_id = await avito.upload_image(image, user_id=user_id)
+
+        def make_call(chat_id: str) -> SendMessage | SendImage:
+            return SendImage(user_id=user_id, chat_id=chat_id, image_id=image_id)
+
+    async def send(chat_id: str) -> Message:
+        result = await avito(make_call(chat_id))
+        if store is not None:
+            await store.add(chat_id)
+        return result
+
+    # closing the broadcast early must stop the sends in flight right away
+    async with aclosing(
+        bounded_map(send, _pending(chat_ids, done), concurrency)
+    ) as results:
+        async for chat_id, result in results:
+            if isinstance(result, BaseException):
+                yield BroadcastResult(chat_id=chat_id, error=result)
+            else:
+                yield BroadcastResult(chat_id=chat_id, message=result)
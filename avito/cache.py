@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Iterator, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(MutableMapping, Generic[K, V]):
+    """
+    Size-bounded LRU mapping with per-entry time to live.
+
+    All operations are O(1) amortized: expired entries are dropped on access
+    and from the least recently used end on insert.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        sliding: bool = False,
+        on_evict: Callable[[K, V], None] | None = None,
+    ):
+        """
+        :param maxsize: max number of entries, least recently used are evicted first
+        :param ttl: default time to live in seconds, None for no expiration
+        :param sliding: restart ttl of an entry on every read
+        :param on_evict: called with entries removed because of size or ttl
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sliding = sliding
+        self.on_evict = on_evict
+        self._data: OrderedDict[K, tuple[float | None, float | None, V]] = OrderedDict()
+
+    def _evict(self, key: K, value: V) -> None:
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, ttl, value)
+        self._data.move_to_end(key)
+        self.expire()
+        while len(self._data) > self.maxsize:
+            old_key, (_, _, old_value) = self._data.popitem(last=False)
+            self._evict(old_key, old_value)
+
+    def expire(self) -> None:
+        """Drop expired entries from the least recently used end."""
+        now = time.monotonic()
+        while self._data:
+            key, (expires_at, _, value) = next(iter(self._data.items()))
+            if expires_at is None or expires_at > now:
+                break
+            del self._data[key]
+            self._evict(key, value)
+
+    def __getitem__(self, key: K) -> V:
+        expires_at, ttl, value = self._data[key]
+        now = time.monotonic()
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            self._evict(key, value)
+            raise KeyError(key)
+        if self.sliding and ttl is not None:
+            self._data[key] = (now + ttl, ttl, value)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def popall(self) -> list[tuple[K, V]]:
+        """Remove and return all entries including expired ones."""
+        items = [(key, value) for key, (_, _, value) in self._data.items()]
+        self._data.clear()
+        return items
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    Raw response bodies of read-only methods keyed by ``(client_id, api_method)``.
+
+    Bodies are decoded on every hit, so callers never share mutable models
+    and a cache shared by clients of a pool serves any of them.
+    Time to live comes from ``AvitoMethod.__cache_ttl__``.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        :param maxsize: max number of cached responses, least recently used are evicted
+        """
+        self._entries: TTLCache[tuple[str | None, str], bytes] = TTLCache(maxsize=maxsize)
+        self._stats = CacheStats()
+
+    def get(self, client_id: str | None, api_method: str) -> bytes | None:
+        body = self._entries.get((client_id, api_method))
+        if body is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return body
+
+    def set(self, client_id: str | None, api_method: str, body: bytes, ttl: float) -> None:
+        self._entries.set((client_id, api_method), body, ttl)
+
+    def invalidate(self, client_id: str | None, api_method: str) -> None:
+        if self._entries.pop((client_id, api_method), None) is not None:
+            self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            invalidations=self._stats.invalidations,
+            size=len(self._entries),
+        )
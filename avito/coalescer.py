@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+SAFE_REQUEST_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RequestCoalescer:
+    """
+    Single flight for identical safe requests.
+
+    Concurrent calls with the same key share one request and one result,
+    errors included. Nothing is kept after the request completes,
+    see :class:`avito.cache.ResponseCache` for that.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.requests = 0
+        self.saved = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is None:
+            self.requests += 1
+            future = self._inflight[key] = asyncio.ensure_future(func())
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.saved += 1
+        # a cancelled caller must not cancel the request of the others
+        return await asyncio.shield(future)
+
+    def __len__(self) -> int:
+        """Number of requests in flight."""
+        return len(self._inflight)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from avito.base.methods import AvitoMethod
+
+
+class AvitoError(ValueError):
+    """
+    Base error raised by Avito client.
+
+    Subclasses ValueError to keep compatibility with code catching it.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        code: int | str | None = None,
+        method: AvitoMethod | None = None,
+    ):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.code = code
+        self.method = method
+
+
+class AvitoAPIError(AvitoError):
+    """Avito responded with a non-200 status."""
+
+
+class UnauthorizedError(AvitoAPIError):
+    """Access token is expired, invalid or client credentials are rejected."""
+
+
+class TooManyRequestsError(AvitoAPIError):
+    """Response 429, the request should be retried after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float, **kwargs):
+        super().__init__(message, status=429, **kwargs)
+        self.retry_after = retry_after
+
+
+class ServerError(AvitoAPIError):
+    """Response 5xx."""
+
+
+class BadResponseError(AvitoError):
+    """Response body could not be decoded."""
+
+
+class NetworkError(AvitoError):
+    """
+    Connection failed or timed out.
+
+    ``sent`` is False only when the request surely never reached the server,
+    e.g. connection was refused.
+    """
+
+    def __init__(self, message: str, sent: bool, **kwargs):
+        super().__init__(message, **kwargs)
+        self.sent = sent
+
+
+class ImageValidationError(ValueError):
+    """Image cannot be uploaded: unsupported format or over Avito limits."""
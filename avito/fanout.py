@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+from .base.concurrency import bounded_map
+from .methods import GetMessages
+
+if typing.TYPE_CHECKING:
+    from .avito import Avito
+    from .models import Chat, Message
+
+
+@dataclass(slots=True)
+class ChatHistory:
+    """
+    Messages of one chat fetched by :func:`fetch_histories`.
+
+    ``chat`` is None when listing chats of the account failed,
+    ``error`` is set when the chat or its account failed.
+    """
+
+    avito: Avito
+    chat: Chat | None
+    messages: list[Message] = field(default_factory=list)
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class _ListingFailed:
+    avito: Avito
+    error: BaseException
+
+
+async def fetch_histories(
+    chats: Iterable[Chat] | AsyncIterable[Chat],
+    concurrency: int = 20,
+    per_account: int = 4,
+    max_pages: int | None = 1,
+    page_size: int = 100,
+) -> AsyncIterator[ChatHistory]:
+    """
+    Fetch messages of many chats concurrently and yield them as they complete.
+
+    Chats must be bound to their Avito client (as returned by GetChats).
+    A failed chat is yielded with ``error`` set and does not stop the run.
+    Requests go through the client, so its rate limiter and retry policy apply.
+
+    :param concurrency: chats fetched at once over all accounts
+    :param per_account: chats fetched at once for one account
+    :param max_pages: pages of messages per chat, None for the whole history
+    :param page_size: messages per page, at most 100
+    """
+    semaphores: defaultdict[int, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(per_account)
+    )
+
+    async def fetch(item: Chat | _ListingFailed) -> list[Message]:
+        if isinstance(item, _ListingFailed):
+            raise item.error
+        async with semaphores[id(item.avito)]:
+            return await _fetch_messages(item, max_pages, page_size)
+
+    async for item, result in bounded_map(fetch, chats, concurrency):
+        if isinstance(item, _ListingFailed):
+            yield ChatHistory(avito=item.avito, chat=None, error=item.error)
+        elif isinstance(result, BaseException):
+            yield ChatHistory(avito=item.avito, chat=item, error=result)
+        else:
+            yield ChatHistory(avito=item.avito, chat=item, messages=result)
+
+
+async def fetch_account_histories(
+    clients: Iterable[Avito],
+    concurrency: int = 20,
+    per_account: int = 4,
+    max_pages: int | None = 1,
+    page_size: int = 100,
+    **chat_filters,
+) -> AsyncIterator[ChatHistory]:
+    """
+    Fetch messages of every chat of every account, see :func:`fetch_histories`.
+
+    Chats of ``concurrency`` accounts are interleaved, so the per-account limit
+    does not stall the global one.
+
+    :param chat_filters: keyword arguments of :meth:`Avito.iter_chats`
+    """
+    chats = _interleave(clients, window=concurrency, **chat_filters)
+    async for history in fetch_histories(
+        chats,
+        concurrency=concurrency,
+        per_account=per_account,
+        max_pages=max_pages,
+        page_size=page_size,
+    ):
+        yield history
+
+
+async def _fetch_messages(
+    chat: Chat,
+    max_pages: int | None,
+    page_size: int,
+) -> list[Message]:
+    messages: list[Message] = []
+    page_number = 0
+    while max_pages is None or page_number < max_pages:
+        call = GetMessages(
+            user_id=chat.me_id,
+            chat_id=chat.id,
+            limit=page_size,
+            offset=page_number * page_size,
+        )
+        page = await chat.avito(call)
+        messages.extend(page.messages)
+        page_number += 1
+        if not page.messages or not page.meta.has_more:
+            break
+    return messages
+
+
+async def _interleave(
+    clients: Iterable[Avito],
+    window: int,
+    **chat_filters,
+) -> AsyncIterator[Chat | _ListingFailed]:
+    """Round-robin over chats of at most ``window`` accounts at a time."""
+    clients = iter(clients)
+    active: list[tuple[Avito, AsyncIterator[Chat]]] = []
+
+    def fill():
+        for client in clients:
+            active.append((client, aiter(client.iter_chats(**chat_filters))))
+            if len(active) >= window:
+                break
+
+    fill()
+    while active:
+        for entry in list(active):
+            client, chats = entry
+            try:
+                yield await anext(chats)
+                continue
+            except StopAsyncIteration:
+                pass
+            except Exception as e:
+                yield _ListingFailed(avito=client, error=e)
+            active.remove(entry)
+        fill()
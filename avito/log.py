@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+
+
+@dataclass(frozen=True)
+class RequestLogConfig:
+    """
+    Request/response logging of Avito client.
+
+    Records are emitted with loguru lazy formatting, so nothing is formatted
+    unless a handler accepts ``level``.
+
+    :param level: level of request and response records
+    :param bodies: log request and response bodies, False logs only
+        method, url, status and latency
+    :param max_body_length: truncate logged bodies to this many characters
+    :param sample_rate: share of calls logged with bodies, others are logged
+        without them
+    """
+
+    level: str = "DEBUG"
+    bodies: bool = True
+    max_body_length: int | None = 2000
+    sample_rate: float = 1.0
+
+    def sample(self) -> bool:
+        if not self.bodies:
+            return False
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def body(self, body: Any, sampled: bool) -> LazyBody | str:
+        return LazyBody(self, body) if sampled else ""
+
+    def format_body(self, body: Any) -> str:
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            text = bytes(body).decode(errors="replace")
+        else:
+            text = orjson.dumps(body, default=str).decode()
+        if self.max_body_length is not None and len(text) > self.max_body_length:
+            return f"{text[:self.max_body_length]}... ({len(text)} chars)"
+        return text
+
+
+class LazyBody:
+    """Body placeholder formatted only when the log record is emitted."""
+
+    __slots__ = ("config", "body")
+
+    def __init__(self, config: RequestLogConfig, body: Any):
+        self.config = config
+        self.body = body
+
+    def __format__(self, format_spec: str) -> str:
+        return self.config.format_body(self.body)
@@ -13,6 +13,9 @@ from .schema.messenger.methods import (
     DeleteMessage,
     AddToBlacklist,
     SendMessage,
+    SendImage,
+    UploadImage,
+    UploadImages,
     GetSubscriptions,
     PostWebhook,
     PostWebhookUnsubscribe,
@@ -41,6 +44,9 @@ __all__ = (
     'DeleteMessage',
     'AddToBlacklist',
     'SendMessage',
+    'SendImage',
+    'UploadImage',
+    'UploadImages',
     'GetSubscriptions',
     'PostWebhook',
     'PostWebhookUnsubscribe',
@@ -34,6 +34,8 @@ from .schema.messenger.models import (
     OkResponse,
     WebhookSubscription,
     WebhookSubscriptions,
+    CompactMessage,
+    CompactChat,
 )
 
 from .schema.messenger.black_list import (
@@ -91,6 +93,8 @@ __all__ = (
     'OkResponse',
     'WebhookSubscription',
     'WebhookSubscriptions',
+    'CompactMessage',
+    'CompactChat',
     'Rating',
     'RatingInfo',
     'Status',
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Sequence, TypeVar
+
+P = TypeVar("P")
+T = TypeVar("T")
+
+
+async def paginate(
+    fetch_page: Callable[[int, int], Awaitable[P]],
+    get_items: Callable[[P], Sequence[T]],
+    has_more: Callable[[P, Sequence[T]], bool],
+    page_size: int = 100,
+    offset: int = 0,
+    prefetch: bool = True,
+) -> AsyncIterator[T]:
+    """
+    Iterate items of a limit/offset paginated method.
+
+    The next page is requested as soon as the current one arrives, so it is
+    downloaded while the current page is consumed. At most two pages are held
+    in memory.
+
+    :param fetch_page: coroutine function ``(offset, limit) -> page``
+    :param get_items: items of a page
+    :param has_more: whether there is a page after this one
+    :param prefetch: request the next page before the current one is consumed
+    """
+    pending: asyncio.Future[P] | None = asyncio.ensure_future(
+        fetch_page(offset, page_size)
+    )
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            items = get_items(page)
+            more = bool(items) and has_more(page, items)
+            offset += len(items)
+            if more and prefetch:
+                pending = asyncio.ensure_future(fetch_page(offset, page_size))
+            del page
+            for item in items:
+                yield item
+            if more and not prefetch:
+                pending = asyncio.ensure_future(fetch_page(offset, page_size))
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+from loguru import logger
+
+from .avito import Avito
+from .base.concurrency import bounded_map
+from .cache import ResponseCache, TTLCache
+from .coalescer import RequestCoalescer
+from .fanout import ChatHistory, fetch_account_histories
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+from .session import ConnectionPoolConfig, SessionFactory
+from .token_store import BaseTokenStore, MemoryTokenStore
+
+T = TypeVar("T")
+
+
+class AvitoPool:
+    """
+    Manager of Avito clients for many seller accounts keyed by ``client_id``.
+
+    Clients are created on first use and share one session, token store,
+    rate limiter, response cache and request coalescer. Clients idle for ``idle_ttl`` seconds
+    or beyond ``max_clients`` are evicted; a token stays in the token store,
+    so recreating an evicted client does not request a new one.
+
+    Usage::
+
+        async with AvitoPool({"client_id": "client_secret"}) as pool:
+            me = await pool["client_id"].get_self_info()
+            async for client_id, result in pool.run_all(
+                lambda avito: avito.get_self_balance(), concurrency=20
+            ):
+                ...
+    """
+
+    def __init__(
+        self,
+        credentials: dict[str, str] | None = None,
+        *,
+        max_clients: int = 1000,
+        idle_ttl: float | None = 600.0,
+        connection_pool: ConnectionPoolConfig | None = None,
+        session_factory: SessionFactory | None = None,
+        token_store: BaseTokenStore | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        response_cache: ResponseCache | None = None,
+        response_cache_size: int = 10_000,
+        base_url: str = "https://api.avito.ru",
+        **client_kwargs,
+    ):
+        """
+        :param credentials: ``client_id`` to ``client_secret`` mapping
+        :param max_clients: max number of live clients
+        :param idle_ttl: seconds after the last use to evict a client, None disables
+        :param session_factory: shared session, by default the pool creates and owns one
+        :param response_cache: shared cache of read-only responses
+        :param response_cache_size: max number of cached responses of the default cache
+        :param client_kwargs: other keyword arguments of :class:`Avito`
+        """
+        self._credentials: dict[str, tuple[str, str | None, int | None]] = {}
+        for client_id, client_secret in (credentials or {}).items():
+            self.add_account(client_id, client_secret)
+        self._owns_session_factory = session_factory is None
+        self.session_factory = session_factory or SessionFactory(connection_pool)
+        self.token_store = token_store or MemoryTokenStore()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache or ResponseCache(maxsize=response_cache_size)
+        self.coalescer = RequestCoalescer()
+        self.base_url = base_url
+        self.client_kwargs = client_kwargs
+        self._clients: TTLCache[str, Avito] = TTLCache(
+            maxsize=max_clients,
+            ttl=idle_ttl,
+            sliding=True,
+            on_evict=self._on_evict,
+        )
+        self._closing: set[asyncio.Task] = set()
+
+    def add_account(
+        self,
+        client_id: str,
+        client_secret: str,
+        token: str | None = None,
+        user_id: int | None = None,
+    ) -> None:
+        """
+        :param user_id: account id, saves a GetUserInfoSelf call per client
+        """
+        self._credentials[client_id] = (client_secret, token, user_id)
+
+    def remove_account(self, client_id: str) -> None:
+        self._credentials.pop(client_id, None)
+        client = self._clients.pop(client_id, None)
+        if client is not None:
+            self._on_evict(client_id, client)
+
+    @property
+    def client_ids(self) -> list[str]:
+        return list(self._credentials)
+
+    def get(self, client_id: str) -> Avito:
+        # evict idle clients so their renewal tasks stop without waiting for an insert
+        self._clients.expire()
+        client = self._clients.get(client_id)
+        if client is not None:
+            return client
+        try:
+            client_secret, token, user_id = self._credentials[client_id]
+        except KeyError:
+            raise KeyError(f"Unknown account {client_id}") from None
+        client = Avito(
+            token=token,
+            client_id=client_id,
+            client_secret=client_secret,
+            base_url=self.base_url,
+            user_id=user_id,
+            token_store=self.token_store,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            session_factory=self.session_factory,
+            response_cache=self.response_cache,
+            coalescer=self.coalescer,
+            **self.client_kwargs,
+        )
+        self._clients[client_id] = client
+        return client
+
+    __getitem__ = get
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._credentials
+
+    def __len__(self) -> int:
+        """Number of live clients."""
+        self._clients.expire()
+        return len(self._clients)
+
+    def _on_evict(self, client_id: str, client: Avito) -> None:
+        logger.debug(f"Evicting client [{client_id}]")
+        # the shared limiter would keep buckets of every account ever used
+        self.rate_limiter.forget(client_id)
+        try:
+            task = asyncio.get_running_loop().create_task(client.close())
+        except RuntimeError:
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def run_all(
+        self,
+        func: Callable[[Avito], Awaitable[T]],
+        concurrency: int = 10,
+        client_ids: Iterable[str] | None = None,
+    ) -> AsyncIterator[tuple[str, T | BaseException]]:
+        """
+        Run ``func`` for every account with at most ``concurrency`` accounts at once.
+
+        Yields ``(client_id, result)`` as they complete, an exception is yielded
+        in place of the result of a failed account.
+        """
+        async def call(client_id: str) -> T:
+            return await func(self.get(client_id))
+
+        ids = self.client_ids if client_ids is None else client_ids
+        async for client_id, result in bounded_map(call, ids, concurrency):
+            yield client_id, result
+
+    def fetch_histories(
+        self,
+        concurrency: int = 20,
+        per_account: int = 4,
+        max_pages: int | None = 1,
+        page_size: int = 100,
+        client_ids: Iterable[str] | None = None,
+        **chat_filters,
+    ) -> AsyncIterator[ChatHistory]:
+        """
+        Fetch messages of every chat of every account,
+        see :func:`avito.fanout.fetch_account_histories`.
+        """
+        ids = self.client_ids if client_ids is None else client_ids
+        return fetch_account_histories(
+            (self.get(client_id) for client_id in ids),
+            concurrency=concurrency,
+            per_account=per_account,
+            max_pages=max_pages,
+            page_size=page_size,
+            **chat_filters,
+        )
+
+    async def close(self) -> None:
+        clients = [client for _, client in self._clients.popall()]
+        await asyncio.gather(
+            *(client.close() for client in clients),
+            *self._closing,
+            return_exceptions=True,
+        )
+        if self._owns_session_factory:
+            await self.session_factory.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,162 @@
+"""
+Optional image preprocessing before upload, requires Pillow
+(``pip install avito-py[images]``).
+
+Images are checked against Avito limits (format, 24 MB, 75 megapixels),
+downsized to ``max_side`` and recompressed to ``quality``, so that less is
+uploaded and oversized photos fail before the transfer, not after it.
+Work runs in an executor, a process pool scales it past the GIL::
+
+    preprocessor = ImagePreprocessor(
+        PreprocessConfig(max_side=2048, quality=85),
+        executor=ProcessPoolExecutor(),
+    )
+    avito = Avito(..., image_preprocessor=preprocessor)
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .exceptions import ImageValidationError
+from .upload import BUFFER_TYPES, ImageSource
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+MAX_BYTES = 24 * 1024 * 1024
+MAX_PIXELS = 75_000_000
+
+
+@dataclass(frozen=True)
+class PreprocessConfig:
+    """
+    :param max_side: longest side of the uploaded image, None keeps the size
+    :param quality: JPEG quality of recompressed images
+    :param target_bytes: lower quality down to ``min_quality`` until the image fits,
+        images already within ``max_side`` and ``target_bytes`` are uploaded as is
+    """
+
+    max_side: int | None = 2560
+    quality: int = 85
+    min_quality: int = 50
+    target_bytes: int | None = 2 * 1024 * 1024
+    max_bytes: int = MAX_BYTES
+    max_pixels: int = MAX_PIXELS
+    formats: frozenset[str] = frozenset({"JPEG", "PNG", "GIF", "BMP"})
+
+
+def _open(source: str | bytes | memoryview) -> Image.Image:
+    if isinstance(source, str):
+        return Image.open(source)
+    return Image.open(io.BytesIO(source))
+
+
+def _keeps_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "P") and "A" in image.getbands()
+
+
+def _encode(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if _keeps_alpha(image):
+        # quality does not apply to PNG
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def preprocess_image(source: str | bytes | memoryview, config: PreprocessConfig) -> bytes | None:
+    """
+    Validate, downsize and recompress one image, runs in a worker.
+
+    :param source: file path or image bytes
+    :return: new image bytes, None when the source can be uploaded as is
+    :raise ImageValidationError: the image cannot be uploaded
+    """
+    if isinstance(source, str):
+        size = os.path.getsize(source)
+    else:
+        size = memoryview(source).nbytes
+    try:
+        image = _open(source)
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ImageValidationError(f"Cannot read image: {e}") from e
+    with image:
+        if image.format not in config.formats:
+            raise ImageValidationError(f"Unsupported image format {image.format}")
+        width, height = image.size
+        too_large = config.max_side is not None and max(width, height) > config.max_side
+        too_heavy = config.target_bytes is not None and size > config.target_bytes
+        if not too_large and not too_heavy:
+            if size > config.max_bytes or width * height > config.max_pixels:
+                raise ImageValidationError(
+                    f"Image {width}x{height} {size} bytes exceeds Avito limits"
+                )
+            return None
+        if too_large:
+            box = (config.max_side, config.max_side)
+            # JPEG decoder scales down by DCT, much faster than a full decode
+            image.draft("RGB", box)
+        # phone photos are rotated by EXIF, which is not kept
+        image = ImageOps.exif_transpose(image)
+        if too_large:
+            image.thumbnail(box, Image.Resampling.LANCZOS)
+        quality = config.quality
+        data = _encode(image, quality)
+        while (
+            not _keeps_alpha(image)
+            and config.target_bytes is not None
+            and len(data) > config.target_bytes
+            and quality > config.min_quality
+        ):
+            quality = max(quality - 10, config.min_quality)
+            data = _encode(image, quality)
+        width, height = image.size
+    if len(data) > config.max_bytes or width * height > config.max_pixels:
+        raise ImageValidationError(
+            f"Image {width}x{height} {len(data)} bytes exceeds Avito limits"
+        )
+    if len(data) >= size and not too_large:
+        return None
+    return data
+
+
+class ImagePreprocessor:
+    """
+    Runs :func:`preprocess_image` off the event loop.
+
+    Pillow holds the GIL for part of the work, so with threads the loop still
+    lags by about 100 ms per large photo (see ``benchmarks/bench_preprocess.py``).
+    Pass a :class:`~concurrent.futures.ProcessPoolExecutor` to keep the loop responsive.
+
+    :param executor: thread or process pool, the loop default thread pool by default
+    """
+
+    def __init__(self, config: PreprocessConfig | None = None, executor: Executor | None = None):
+        if Image is None:
+            raise ImportError("Image preprocessing requires Pillow: pip install avito-py[images]")
+        self.config = config or PreprocessConfig()
+        self.executor = executor
+
+    async def process(self, source: ImageSource) -> ImageSource:
+        """
+        :return: smaller image bytes or ``source`` itself, async streams pass through
+        """
+        if isinstance(source, os.PathLike):
+            source = os.fspath(source)
+        if not isinstance(source, (str, *BUFFER_TYPES)):
+            return source
+        if isinstance(source, memoryview) and isinstance(self.executor, ProcessPoolExecutor):
+            # memoryview cannot be pickled
+            source = source.tobytes()
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(self.executor, preprocess_image, source, self.config)
+        return source if data is None else data
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Token bucket settings.
+
+    :param rate: requests per second
+    :param burst: bucket capacity, requests allowed at once after idle
+    """
+
+    rate: float
+    burst: int = 1
+
+
+@dataclass
+class WaitStats:
+    requests: int = 0
+    delayed: int = 0
+    waited_total: float = 0.0
+    waited_max: float = 0.0
+
+    @property
+    def waited_avg(self) -> float:
+        return self.waited_total / self.requests if self.requests else 0.0
+
+    def add(self, waited: float) -> None:
+        self.requests += 1
+        if waited > 0:
+            self.delayed += 1
+            self.waited_total += waited
+            self.waited_max = max(self.waited_max, waited)
+
+
+class TokenBucket:
+    def __init__(self, limit: RateLimit | None):
+        self.limit = limit
+        self.tokens = float(limit.burst) if limit else 0.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def is_idle(self) -> bool:
+        """No waiters and no pause, dropping the bucket loses nothing but burst."""
+        return not self._lock.locked() and self.paused_until <= time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            float(self.limit.burst),
+            self.tokens + (now - self.updated) * self.limit.rate,
+        )
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot.
+
+        :return: seconds spent waiting
+        """
+        started = time.monotonic()
+        delayed = self._lock.locked()
+        # lock keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delayed = True
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if self.limit is None:
+                    break
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                delayed = True
+                await asyncio.sleep((1 - self.tokens) / self.limit.rate)
+        return time.monotonic() - started if delayed else 0.0
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter with a token bucket per ``client_id`` and endpoint family.
+
+    Family is the first segment of the api method path: ``messenger``, ``core``,
+    ``ratings``, ``token``. Families without a configured limit are only paused
+    on 429 responses.
+
+    One limiter can be shared between several Avito clients.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit] | None = None,
+        default: RateLimit | None = None,
+        client_limits: dict[str, dict[str, RateLimit]] | None = None,
+    ):
+        """
+        :param limits: limits per endpoint family
+        :param default: limit for families missing in ``limits``
+        :param client_limits: overrides of ``limits`` per ``client_id``
+        """
+        self.limits = limits or {}
+        self.default = default
+        self.client_limits = client_limits or {}
+        self._buckets: dict[str | None, dict[str, TokenBucket]] = {}
+        self._stats: dict[str, WaitStats] = {}
+
+    @staticmethod
+    def family_of(api_method: str) -> str:
+        return api_method.lstrip("/").split("/", 1)[0]
+
+    def get_limit(self, client_id: str | None, family: str) -> RateLimit | None:
+        limits = self.client_limits.get(client_id, self.limits)
+        return limits.get(family, self.limits.get(family, self.default))
+
+    def bucket(self, client_id: str | None, family: str) -> TokenBucket:
+        buckets = self._buckets.get(client_id)
+        if buckets is None:
+            buckets = self._buckets[client_id] = {}
+        bucket = buckets.get(family)
+        if bucket is None:
+            bucket = buckets[family] = TokenBucket(self.get_limit(client_id, family))
+        return bucket
+
+    def forget(self, client_id: str | None) -> None:
+        """
+        Drop buckets of a client that is gone, e.g. evicted from a pool.
+
+        Buckets with waiters or a 429 pause are kept.
+        """
+        buckets = self._buckets.pop(client_id, None)
+        if not buckets:
+            return
+        busy = {family: bucket for family, bucket in buckets.items() if not bucket.is_idle()}
+        if busy:
+            self._buckets[client_id] = busy
+
+    async def acquire(self, client_id: str | None, family: str) -> float:
+        waited = await self.bucket(client_id, family).acquire()
+        self._stats.setdefault(family, WaitStats()).add(waited)
+        return waited
+
+    def pause(self, client_id: str | None, family: str, seconds: float) -> None:
+        self.bucket(client_id, family).pause(seconds)
+
+    def stats(self) -> dict[str, WaitStats]:
+        """Wait statistics per endpoint family."""
+        return dict(self._stats)
+
+
+def parse_retry_after(value: str | None, default: float = 1.0) -> float:
+    """
+    Parse ``Retry-After`` header, either delay in seconds or HTTP date.
+    """
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import random
+import typing
+from dataclasses import dataclass
+
+from .exceptions import AvitoError, NetworkError, ServerError, TooManyRequestsError
+
+if typing.TYPE_CHECKING:
+    from avito.base.methods import AvitoMethod
+
+IDEMPOTENT_REQUEST_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def is_idempotent(method: AvitoMethod) -> bool:
+    if method.__idempotent__ is not None:
+        return method.__idempotent__
+    return method.__request_method__ in IDEMPOTENT_REQUEST_METHODS
+
+
+class RetryBudget:
+    """
+    Limits retries to a share of requests made by a client.
+
+    Every request deposits ``ratio`` retries (up to ``burst``), every retry
+    withdraws one. Under an outage retries stop before they multiply the load.
+    """
+
+    def __init__(self, ratio: float = 0.2, burst: int = 10):
+        self.ratio = ratio
+        self.burst = burst
+        self.balance = float(burst)
+
+    def deposit(self) -> None:
+        self.balance = min(float(self.burst), self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Non-idempotent methods (e.g. SendMessage) are retried only when the request
+    surely did not reach Avito: 429 or connection refused. 5xx and timeouts
+    may have been processed, so retrying them could duplicate a message.
+
+    :param max_attempts: attempts including the first one
+    :param base_delay: delay before the first retry
+    :param max_delay: upper bound of a delay
+    :param jitter: randomize delay in ``[0, delay]``
+    :param budget_ratio: retries earned by every request, see :class:`RetryBudget`
+    :param budget_burst: retries available at once
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    jitter: bool = True
+    budget_ratio: float = 0.2
+    budget_burst: int = 10
+
+    def new_budget(self) -> RetryBudget:
+        return RetryBudget(ratio=self.budget_ratio, burst=self.budget_burst)
+
+    def is_retryable(self, method: AvitoMethod, error: AvitoError) -> bool:
+        if isinstance(error, TooManyRequestsError):
+            return True
+        if isinstance(error, NetworkError):
+            return not error.sent or is_idempotent(method)
+        if isinstance(error, ServerError):
+            return is_idempotent(method)
+        return False
+
+    def should_retry(
+        self,
+        method: AvitoMethod,
+        error: AvitoError,
+        attempt: int,
+        budget: RetryBudget | None = None,
+    ) -> bool:
+        """
+        :param attempt: number of attempts made so far
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(method, error):
+            return False
+        return budget is None or budget.withdraw()
+
+    def get_delay(self, attempt: int, error: AvitoError) -> float:
+        if isinstance(error, TooManyRequestsError):
+            # rate limiter bucket is already paused for Retry-After
+            return 0.0
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
@@ -28,6 +28,7 @@ class GetTokenOAuth(AvitoMethod[OAuthToken]):
 
 class GetToken(AvitoMethod[Token]):
     __returning__ = Token
+    __idempotent__ = True
     __api_method__ = "token"
 
     client_id: str
@@ -35,8 +36,9 @@ class GetToken(AvitoMethod[Token]):
     grant_type: GrantType = Field(default=GrantType.CLIENT_CREDENTIALS)
 
 
-class RefreshOAuthToken(AvitoMethod[Token]):
-    __returning__ = Token
+class RefreshOAuthToken(AvitoMethod[OAuthToken]):
+    # refresh response carries a new refresh_token as well
+    __returning__ = OAuthToken
     __api_method__ = "token"
 
     client_id: str
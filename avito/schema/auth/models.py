@@ -21,11 +21,23 @@ class BaseToken(AvitoObject, abc.ABC):
 
     @model_validator(mode="after")
     def set_expires_at(self):
-        self.expires_at = self.expires_in + datetime.now().timestamp()
+        # keep expires_at of tokens loaded back from a token store
+        if not self.expires_at:
+            self.expires_at = self.expires_in + datetime.now().timestamp()
         return self
 
-    def is_expired(self) -> bool:
-        return self.expires_at < datetime.now().timestamp()
+    def is_expired(self, margin: float = .0) -> bool:
+        """
+        Check whether the token is expired or expires within ``margin`` seconds.
+
+        :param margin: seconds before ``expires_at`` to treat the token as expired
+        :return: True if the token should be renewed
+        """
+        return self.expires_at - margin < datetime.now().timestamp()
+
+    @abc.abstractmethod
+    def refresh(self, client_id: str, client_secret: str) -> GetToken | RefreshOAuthToken:
+        ...
 
 
 
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import abc
 import typing
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+from pydantic import PrivateAttr, field_serializer
 
 from avito.base.methods import AvitoMethod
+from avito.upload import ImageSource, StreamGuard, describe, make_form
 
 from .black_list import AddBlackListRequest
 from .models import (
@@ -21,6 +27,22 @@ if typing.TYPE_CHECKING:
     pass
 
 
+def with_query(path: str, **params: Any) -> str:
+    """Append query string built from params that are not None."""
+    query = {
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in params.items()
+        if value is not None
+    }
+    if not query:
+        return path
+    return f"{path}?{urlencode(query)}"
+
+
+def chat_path(user_id: int, chat_id: str) -> str:
+    return f"messenger/v2/accounts/{user_id}/chats/{chat_id}"
+
+
 class GetMessages(AvitoMethod[Messages]):
     __request_method__ = "GET"
     __returning__ = Messages
@@ -33,12 +55,11 @@ class GetMessages(AvitoMethod[Messages]):
 
     @property
     def __api_method__(self) -> str:
-        method = f"messenger/v3/accounts/{self.user_id}/chats/{self.chat_id}/messages/"
-        if self.limit:
-            method += f"?limit={self.limit}"
-        if self.offset:
-            method += f"&offset={self.offset}"
-        return method
+        return with_query(
+            f"messenger/v3/accounts/{self.user_id}/chats/{self.chat_id}/messages/",
+            limit=self.limit,
+            offset=self.offset or None,
+        )
 
 
 class GetChats(AvitoMethod[Chats]):
@@ -53,36 +74,43 @@ class GetChats(AvitoMethod[Chats]):
     limit: Optional[int] = None
     offset: Optional[int] = None
 
+    def bind_response(self, response: Chats) -> Chats:
+        for chat in response.chats:
+            chat.as_account(self.user_id)
+        return response
+
     @property
     def __api_method__(self) -> str:
         # https://api.avito.ru/messenger/v2/accounts/{user_id}/chats
-        method = f"messenger/v2/accounts/{self.user_id}/chats"
-        if self.item_ids:
-            method += f"?item_ids={','.join(map(str, self.item_ids))}"
-        if self.unread_only:
-            method += f"&unread_only={self.unread_only}"
-        if self.chat_types:
-            method += f"&chat_types={self.chat_types}"
-        if self.limit:
-            method += f"&limit={self.limit}"
-        if self.offset:
-            method += f"&offset={self.offset}"
-        return method
+        return with_query(
+            f"messenger/v2/accounts/{self.user_id}/chats",
+            item_ids=",".join(map(str, self.item_ids)) if self.item_ids else None,
+            unread_only=self.unread_only or None,
+            chat_types=self.chat_types,
+            limit=self.limit,
+            offset=self.offset or None,
+        )
 
 
 class GetChat(AvitoMethod[Chat]):
+    __request_method__ = "GET"
     __returning__ = Chat
+    __cache_ttl__ = 5.0
 
     user_id: int
     chat_id: str
 
+    def bind_response(self, response: Chat) -> Chat:
+        return response.as_account(self.user_id)
+
     @property
     def __api_method__(self) -> str:
-        return f"messenger/v2/accounts/{self.user_id}/chats/{self.chat_id}"
+        return chat_path(self.user_id, self.chat_id)
 
 
 class ChatRead(AvitoMethod[OkResponse]):
     __returning__ = OkResponse
+    __idempotent__ = True
 
     user_id: int
     chat_id: str
@@ -92,9 +120,14 @@ class ChatRead(AvitoMethod[OkResponse]):
         # https://api.avito.ru/messenger/v1/accounts/{user_id}/chats/{chat_id}/read
         return f"messenger/v1/accounts/{self.user_id}/chats/{self.chat_id}/read"
 
+    @property
+    def __invalidates__(self) -> tuple[str, ...]:
+        return (chat_path(self.user_id, self.chat_id),)
+
 
 class DeleteMessage(AvitoMethod[OkResponse]):
     __returning__ = OkResponse
+    __idempotent__ = True
 
     user_id: int
     chat_id: str
@@ -105,9 +138,14 @@ class DeleteMessage(AvitoMethod[OkResponse]):
         # https://api.avito.ru/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages/{message_id}
         return f"messenger/v1/accounts/{self.user_id}/chats/{self.chat_id}/messages/{self.message_id}"
 
+    @property
+    def __invalidates__(self) -> tuple[str, ...]:
+        return (chat_path(self.user_id, self.chat_id),)
+
 
 class AddToBlacklist(AvitoMethod[OkResponse]):
     __returning__ = OkResponse
+    __idempotent__ = True
 
     users: list[AddBlackListRequest]
 
@@ -134,6 +172,10 @@ class SendMessage(AvitoMethod[Message]):
         # https://api.avito.ru/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages
         return f"messenger/v1/accounts/{self.user_id}/chats/{self.chat_id}/messages"
 
+    @property
+    def __invalidates__(self) -> tuple[str, ...]:
+        return (chat_path(self.user_id, self.chat_id),)
+
 
 class SendImage(AvitoMethod[Message]):
     __content_type__ = "json"
@@ -153,48 +195,89 @@ class SendImage(AvitoMethod[Message]):
             f"messenger/v1/accounts/{self.user_id}/chats/{self.chat_id}/messages/image"
         )
 
+    @property
+    def __invalidates__(self) -> tuple[str, ...]:
+        return (chat_path(self.user_id, self.chat_id),)
+
 
-class UploadImage(AvitoMethod[dict]):
+class BaseUploadImage(AvitoMethod[dict], abc.ABC):
     __request_method__ = "POST"
     __content_type__ = "multipart/form-data"
     __returning__ = dict
 
     user_id: int
-    file_path: str
+
+    _guard: Optional[StreamGuard] = PrivateAttr(None)
 
     @property
     def __api_method__(self) -> str:
         return f"messenger/v1/accounts/{self.user_id}/uploadImages"
 
-    # def model_post_init(self, __context: typing.Any) -> None:
-    #     if not self.file_path.lower().endswith(
-    #         (".png", ".jpg", ".jpeg", ".gif", ".bmp")
-    #     ):
-    #         raise ValueError(
-    #             "Invalid file format. Supported formats are: PNG, JPEG, GIF, BMP"
-    #         )
+    @abc.abstractmethod
+    def sources(self) -> list[ImageSource]:
+        ...
+
+    def filenames(self) -> list[str] | None:
+        return None
+
+    def make_form(self) -> aiohttp.MultipartWriter:
+        """Multipart body of one attempt."""
+        sources = self.sources()
+        if self._guard is None:
+            self._guard = StreamGuard(sources)
+        self._guard.check()
+        return make_form(sources, self.filenames())
+
+
+class UploadImage(BaseUploadImage):
+    """
+    Upload one image.
+
+    :param file_path: path, bytes-like or async stream of bytes,
+        see :mod:`avito.upload`
+    """
+
+    file_path: Any
+    filename: Optional[str] = None
+
+    @field_serializer("file_path")
+    def _describe_source(self, source: Any) -> str:
+        return describe(source)
+
+    def sources(self) -> list[ImageSource]:
+        return [self.file_path]
+
+    def filenames(self) -> list[str] | None:
+        return [self.filename] if self.filename else None
+
+
+class UploadImages(BaseUploadImage):
+    """Upload several images in one request, response has an id per image."""
+
+    images: list[Any]
+    names: Optional[list[str]] = None
+
+    @field_serializer("images")
+    def _describe_sources(self, sources: list[Any]) -> list[str]:
+        return [describe(source) for source in sources]
 
-    #     # check file size
-    #     if Path(self.file_path).stat().st_size > 24 * 1024 * 1024:
-    #         raise ValueError("File size exceeds the maximum limit of 24 MB.")
+    def sources(self) -> list[ImageSource]:
+        return self.images
 
-    #     # check file dimensions
-    #     with Image.open(self.file_path) as img:
-    #         width, height = img.size
-    #         if width * height > 75_000_000:
-    #             raise ValueError(
-    #                 "Image resolution exceeds the maximum limit of 75 megapixels."
-    #             )
+    def filenames(self) -> list[str] | None:
+        return self.names
 
 
 class GetSubscriptions(AvitoMethod[WebhookSubscriptions]):
     __returning__ = WebhookSubscriptions
+    __idempotent__ = True
     __api_method__ = "messenger/v1/subscriptions"
 
 
 class PostWebhook(AvitoMethod[OkResponse]):
     __content_type__ = "json"
     __returning__ = OkResponse
+    __idempotent__ = True
     __api_method__ = "messenger/v3/webhook"
 
     url: str
@@ -203,6 +286,7 @@ class PostWebhook(AvitoMethod[OkResponse]):
 class PostWebhookUnsubscribe(AvitoMethod[OkResponse]):
     __content_type__ = "json"
     __returning__ = OkResponse
+    __idempotent__ = True
     __api_method__ = "messenger/v1/webhook/unsubscribe"
 
     url: str
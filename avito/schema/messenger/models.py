@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import sys
 import typing
 from enum import StrEnum
-from typing import List, Optional
+from typing import Any, AsyncIterator, Iterable, List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+import orjson
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr
 
 from avito.base.models import AvitoObject
 
 from .black_list import Reason
 
 if typing.TYPE_CHECKING:
+    from avito.avito import Avito
+
     from ...methods import (
         AddToBlacklist,
         ChatRead,
@@ -187,11 +191,29 @@ class Chat(AvitoObject):
     updated: int
     users: List[User]
 
+    # account the chat was listed for, see GetChats.bind_response
+    _user_id: Optional[int] = PrivateAttr(None)
+
+    def as_account(self, user_id: int) -> Chat:
+        self._user_id = user_id
+        return self
+
+    @property
+    def me_id(self) -> int:
+        if self._user_id is not None:
+            return self._user_id
+        return super().me_id
+
     def get_messages(self) -> GetMessages:
         from avito.methods import GetMessages
 
         return GetMessages(user_id=self.me_id, chat_id=self.id).as_(self._avito)
 
+    def iter_messages(self, page_size: int = 100) -> AsyncIterator[Message]:
+        return self._avito.iter_messages(
+            chat_id=self.id, page_size=page_size, user_id=self.me_id
+        )
+
     def read(self) -> ChatRead:
         from avito.methods import ChatRead
 
@@ -215,6 +237,11 @@ class WebhookMessage(AvitoObject):
     type: str
     user_id: int
 
+    @property
+    def me_id(self) -> int:
+        # user_id of a webhook message is the receiving account
+        return self.user_id
+
     def answer(self, text: str) -> SendMessage:
         from avito.methods import SendMessage
         from avito.models import MessageToSend
@@ -226,7 +253,7 @@ class WebhookMessage(AvitoObject):
     async def answer_image(self, file_path: str) -> SendImage:
         from avito.schema.messenger.methods import SendImage
 
-        image_id = await self._avito.upload_image(file_path)
+        image_id = await self._avito.upload_image(file_path, user_id=self.me_id)
         return SendImage(
             user_id=self.me_id,
             chat_id=self.chat_id,
@@ -318,3 +345,247 @@ class WebhookSubscription(AvitoObject):
 
 class WebhookSubscriptions(AvitoObject):
     subscriptions: List[WebhookSubscription]
+
+
+class Interner:
+    """
+    Deduplicates equal values so repeated ids and payloads share one object.
+
+    Use one interner for a batch of compact records, it holds every value it has seen.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        self._values: dict[Any, Any] = {}
+
+    def __call__(self, value):
+        if value is None:
+            return None
+        if type(value) is str:
+            return sys.intern(value)
+        return self._values.setdefault(value, value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def _dumps_or_none(value: Any) -> bytes | None:
+    return orjson.dumps(value) if value else None
+
+
+class CompactMessage:
+    """
+    Read-only compact record of :class:`Message` for holding large histories in memory.
+
+    Text messages keep only scalar fields, other content and quote are kept
+    as json bytes. :meth:`expand` builds the full model on demand.
+    """
+
+    __slots__ = (
+        "id",
+        "author_id",
+        "created",
+        "direction",
+        "type",
+        "text",
+        "is_read",
+        "read",
+        "_content",
+        "_quote",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        author_id: int,
+        created: int,
+        direction: Direction | str,
+        type: MessageType | str,
+        text: str | None = None,
+        is_read: bool | None = None,
+        read: int | None = None,
+        content: bytes | None = None,
+        quote: bytes | None = None,
+    ):
+        setattr_ = object.__setattr__
+        setattr_(self, "id", id)
+        setattr_(self, "author_id", author_id)
+        setattr_(self, "created", created)
+        setattr_(self, "direction", direction)
+        setattr_(self, "type", type)
+        setattr_(self, "text", text)
+        setattr_(self, "is_read", is_read)
+        setattr_(self, "read", read)
+        setattr_(self, "_content", content)
+        setattr_(self, "_quote", quote)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"CompactMessage(id={self.id!r}, created={self.created}, text={self.text!r})"
+
+    @classmethod
+    def from_dict(cls, data: dict, intern: Interner | None = None) -> CompactMessage:
+        """
+        :param data: message json as returned by Avito
+        :param intern: interner shared by the batch
+        """
+        intern = Interner() if intern is None else intern
+        content = dict(data.get("content") or {})
+        text = content.pop("text", None)
+        return cls(
+            id=data["id"],
+            author_id=intern(data["author_id"]),
+            created=data["created"],
+            direction=Direction._value2member_map_.get(data["direction"], data["direction"]),
+            type=MessageType._value2member_map_.get(data["type"], data["type"]),
+            text=text,
+            is_read=data.get("isRead"),
+            read=data.get("read"),
+            content=intern(_dumps_or_none(content)),
+            quote=_dumps_or_none(data.get("quote")),
+        )
+
+    @classmethod
+    def from_model(cls, message: Message, intern: Interner | None = None) -> CompactMessage:
+        return cls.from_dict(message.model_dump(mode="json", by_alias=True), intern)
+
+    def to_dict(self) -> dict:
+        content = orjson.loads(self._content) if self._content else {}
+        if self.text is not None:
+            content["text"] = self.text
+        data = {
+            "author_id": self.author_id,
+            "content": content,
+            "created": self.created,
+            "direction": str(self.direction),
+            "id": self.id,
+            "type": str(self.type),
+        }
+        if self.is_read is not None:
+            data["isRead"] = self.is_read
+        if self.read is not None:
+            data["read"] = self.read
+        if self._quote is not None:
+            data["quote"] = orjson.loads(self._quote)
+        return data
+
+    def expand(self, avito: Avito | None = None) -> Message:
+        """Build full :class:`Message` bound to ``avito``."""
+        return Message.model_validate(self.to_dict(), context={"avito": avito})
+
+
+class CompactChat:
+    """
+    Read-only compact record of :class:`Chat`.
+
+    Users and item context are kept as json bytes deduplicated through
+    :class:`Interner`, so a buyer or an item shared by many chats is stored once.
+    :meth:`expand` builds the full model on demand.
+    """
+
+    __slots__ = (
+        "id",
+        "created",
+        "updated",
+        "item_id",
+        "user_ids",
+        "last_message",
+        "_context",
+        "_users",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        created: int,
+        updated: int,
+        item_id: int | None,
+        user_ids: tuple[int, ...],
+        last_message: CompactMessage,
+        context: bytes,
+        users: tuple[bytes, ...],
+    ):
+        setattr_ = object.__setattr__
+        setattr_(self, "id", id)
+        setattr_(self, "created", created)
+        setattr_(self, "updated", updated)
+        setattr_(self, "item_id", item_id)
+        setattr_(self, "user_ids", user_ids)
+        setattr_(self, "last_message", last_message)
+        setattr_(self, "_context", context)
+        setattr_(self, "_users", users)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"CompactChat(id={self.id!r}, updated={self.updated})"
+
+    @classmethod
+    def from_dict(cls, data: dict, intern: Interner | None = None) -> CompactChat:
+        """
+        :param data: chat json as returned by Avito
+        :param intern: interner shared by the batch
+        """
+        intern = Interner() if intern is None else intern
+        context = data.get("context") or {}
+        users = data.get("users") or []
+        return cls(
+            id=intern(data["id"]),
+            created=data["created"],
+            updated=data["updated"],
+            item_id=intern((context.get("value") or {}).get("id")),
+            user_ids=intern(tuple(intern(user["id"]) for user in users)),
+            last_message=CompactMessage.from_dict(data["last_message"], intern),
+            context=intern(orjson.dumps(context)),
+            users=intern(tuple(intern(orjson.dumps(user)) for user in users)),
+        )
+
+    @classmethod
+    def from_model(cls, chat: Chat, intern: Interner | None = None) -> CompactChat:
+        return cls.from_dict(chat.model_dump(mode="json", by_alias=True), intern)
+
+    def to_dict(self) -> dict:
+        return {
+            "context": orjson.loads(self._context),
+            "created": self.created,
+            "id": self.id,
+            "last_message": self.last_message.to_dict(),
+            "updated": self.updated,
+            "users": [orjson.loads(user) for user in self._users],
+        }
+
+    def expand(self, avito: Avito | None = None) -> Chat:
+        """Build full :class:`Chat` bound to ``avito``."""
+        return Chat.model_validate(self.to_dict(), context={"avito": avito})
+
+
+def compact_messages(
+    messages: Iterable[dict | Message],
+    intern: Interner | None = None,
+) -> list[CompactMessage]:
+    """Convert a batch of messages sharing one interner."""
+    intern = Interner() if intern is None else intern
+    return [
+        CompactMessage.from_model(message, intern)
+        if isinstance(message, Message)
+        else CompactMessage.from_dict(message, intern)
+        for message in messages
+    ]
+
+
+def compact_chats(
+    chats: Iterable[dict | Chat],
+    intern: Interner | None = None,
+) -> list[CompactChat]:
+    """Convert a batch of chats sharing one interner."""
+    intern = Interner() if intern is None else intern
+    return [
+        CompactChat.from_model(chat, intern)
+        if isinstance(chat, Chat)
+        else CompactChat.from_dict(chat, intern)
+        for chat in chats
+    ]
@@ -5,4 +5,5 @@ from.models import RatingInfo
 class GetRatingsInfo(AvitoMethod[RatingInfo]):
     __request_method__ = "GET"
     __returning__ = RatingInfo
+    __cache_ttl__ = 60.0
     __api_method__ = "ratings/v1/info"
@@ -5,12 +5,14 @@ from avito.base.methods import AvitoMethod
 class GetUserInfoSelf(AvitoMethod[UserInfoSelf]):
     __request_method__ = "GET"
     __returning__ = UserInfoSelf
+    __cache_ttl__ = 3600.0
     __api_method__ = "core/v1/accounts/self"
 
 
 class GetUserBalance(AvitoMethod[Balance]):
     __request_method__ = "GET"
     __returning__ = Balance
+    __cache_ttl__ = 10.0
 
     user_id: int
 
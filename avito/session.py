@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+import aiohttp
+
+
+@dataclass(frozen=True)
+class ConnectionPoolConfig:
+    """
+    Settings of the connection pool and HTTP timeouts.
+
+    :param limit: total number of simultaneous connections, 0 for no limit
+    :param limit_per_host: simultaneous connections to one host, 0 for no limit
+    :param keepalive_timeout: seconds to keep an idle connection open
+    :param ttl_dns_cache: seconds to cache resolved addresses, None disables the cache
+    :param total_timeout: timeout of the whole request
+    :param connect_timeout: timeout of acquiring a connection, including pool waiting
+    :param sock_read_timeout: timeout between two reads from the socket
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 60.0
+    ttl_dns_cache: int | None = 300
+    total_timeout: float | None = 60.0
+    connect_timeout: float | None = 10.0
+    sock_read_timeout: float | None = 30.0
+
+    def create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.ttl_dns_cache is not None,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.sock_read_timeout,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+class SessionFactory:
+    """
+    Lazily creates one aiohttp session shared by many Avito clients.
+
+    The session is created on first use inside the running loop, so clients
+    can be constructed anywhere. Keep-alive connections and TLS sessions to
+    api.avito.ru are reused by all clients of the factory.
+
+    The factory is owned by the caller: clients never close it, call :meth:`close`
+    on shutdown.
+    """
+
+    def __init__(self, config: ConnectionPoolConfig | None = None):
+        self.config = config or ConnectionPoolConfig()
+        self._session: aiohttp.ClientSession | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        return self._session
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            async with self._lock:
+                if self._session is None or self._session.closed:
+                    self._session = self.config.create_session()
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
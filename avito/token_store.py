@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+from collections import defaultdict
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, closing
+from pathlib import Path
+from typing import AsyncIterator
+
+import orjson
+
+from .schema.auth.models import BaseToken, OAuthToken, Token
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+def dump_token(token: BaseToken) -> bytes:
+    return orjson.dumps(token.model_dump(mode="json"))
+
+
+def load_token(data: bytes | str) -> BaseToken:
+    raw = orjson.loads(data)
+    if "refresh_token" in raw:
+        return OAuthToken.model_validate(raw)
+    return Token.model_validate(raw)
+
+
+class BaseTokenStore(abc.ABC):
+    """
+    Storage for access tokens shared between Avito clients.
+
+    Tokens are keyed by ``client_id``. :meth:`lock` guards the
+    read-check-refresh-write cycle so that only one client refreshes at a time.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> BaseToken | None:
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, token: BaseToken) -> None:
+        pass
+
+    @abc.abstractmethod
+    def lock(self, key: str) -> AbstractAsyncContextManager[None]:
+        pass
+
+
+class MemoryTokenStore(BaseTokenStore):
+    """Token store shared by clients within one process."""
+
+    def __init__(self):
+        self._tokens: dict[str, BaseToken] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def get(self, key: str) -> BaseToken | None:
+        return self._tokens.get(key)
+
+    async def set(self, key: str, token: BaseToken) -> None:
+        self._tokens[key] = token
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        async with self._locks[key]:
+            yield
+
+
+class FileTokenStore(BaseTokenStore):
+    """
+    Token store keeping one json file per key in ``directory``.
+
+    Refresh is serialized across processes with an exclusive lock on ``<key>.lock``.
+    """
+
+    def __init__(self, directory: str | os.PathLike, poll_interval: float = 0.05):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        safe_key = "".join(c if c.isalnum() or c in "-_" else "_" for c in key)
+        return self.directory / f"{safe_key}{suffix}"
+
+    def _read(self, key: str) -> BaseToken | None:
+        try:
+            data = self._path(key, ".json").read_bytes()
+        except FileNotFoundError:
+            return None
+        return load_token(data)
+
+    def _write(self, key: str, token: BaseToken) -> None:
+        path = self._path(key, ".json")
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        # tokens are secrets, readable by the owner only
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            if hasattr(os, "fchmod"):
+                # a leftover temp file keeps its old mode
+                os.fchmod(fd, 0o600)
+            file.write(dump_token(token))
+        os.replace(tmp_path, path)
+
+    def _try_acquire(self, key: str) -> int | None:
+        fd = os.open(self._path(key, ".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    async def _try_acquire_off_loop(self, key: str) -> int | None:
+        attempt = asyncio.ensure_future(asyncio.to_thread(self._try_acquire, key))
+        try:
+            return await asyncio.shield(attempt)
+        except asyncio.CancelledError:
+            # the thread may still take the lock after the waiter is gone
+            attempt.add_done_callback(self._release_abandoned)
+            raise
+
+    def _release_abandoned(self, attempt: asyncio.Future[int | None]) -> None:
+        if not attempt.cancelled() and attempt.exception() is None and attempt.result() is not None:
+            self._release(attempt.result())
+
+    @staticmethod
+    def _release(fd: int) -> None:
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    async def get(self, key: str) -> BaseToken | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, token: BaseToken) -> None:
+        await asyncio.to_thread(self._write, key, token)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        # non-blocking attempts keep lock waiters from occupying the thread pool
+        async with self._locks[key]:
+            while (fd := await self._try_acquire_off_loop(key)) is None:
+                await asyncio.sleep(self.poll_interval)
+            try:
+                yield
+            finally:
+                await asyncio.to_thread(self._release, fd)
+
+
+class SQLiteTokenStore(BaseTokenStore):
+    """
+    Token store backed by a SQLite database.
+
+    Refresh is serialized with a lease row that expires after ``lock_timeout``
+    seconds, so a crashed process cannot block the others forever.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        lock_timeout: float = 30.0,
+        poll_interval: float = 0.05,
+    ):
+        self.path = str(path)
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS avito_tokens "
+                "(key TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS avito_token_locks "
+                "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.lock_timeout)
+
+    def _read(self, key: str) -> BaseToken | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT data FROM avito_tokens WHERE key = ?", (key,)
+            ).fetchone()
+        return load_token(row[0]) if row else None
+
+    def _write(self, key: str, token: BaseToken) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO avito_tokens (key, data) VALUES (?, ?)",
+                (key, dump_token(token)),
+            )
+
+    def _try_acquire(self, key: str, owner: str) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM avito_token_locks WHERE key = ? AND expires_at < ?",
+                (key, now),
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO avito_token_locks (key, owner, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, owner, now + self.lock_timeout),
+            )
+            return cursor.rowcount == 1
+
+    def _release(self, key: str, owner: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM avito_token_locks WHERE key = ? AND owner = ?",
+                (key, owner),
+            )
+
+    async def get(self, key: str) -> BaseToken | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, token: BaseToken) -> None:
+        await asyncio.to_thread(self._write, key, token)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[None]:
+        owner = uuid.uuid4().hex
+        async with self._locks[key]:
+            while not await asyncio.to_thread(self._try_acquire, key, owner):
+                await asyncio.sleep(self.poll_interval)
+            try:
+                yield
+            finally:
+                await asyncio.to_thread(self._release, key, owner)
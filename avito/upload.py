@@ -0,0 +1,127 @@
+"""
+Image sources for :class:`avito.methods.UploadImage` and ``UploadImages``.
+
+A source is a file path, an in-memory ``bytes`` / ``bytearray`` / ``memoryview``
+or an async iterable of ``bytes``. Files are streamed in chunks with aiofiles,
+so neither the event loop blocks nor the whole file is read into memory.
+Paths and buffers are re-read on retries, an async stream can be sent only once.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from typing import AsyncIterable, AsyncIterator, Union
+
+import aiofiles
+import aiohttp
+
+ImageSource = Union[str, os.PathLike, bytes, bytearray, memoryview, AsyncIterable[bytes]]
+
+CHUNK_SIZE = 256 * 1024
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+# smaller buffers are hashed faster than a thread hop
+INLINE_HASH_SIZE = 64 * 1024
+
+
+async def read_chunks(path: str | os.PathLike, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
+
+def is_stream(source: ImageSource) -> bool:
+    return hasattr(source, "__aiter__")
+
+
+def describe(source: ImageSource) -> str:
+    """Short loggable form of a source."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, BUFFER_TYPES):
+        return f"<{memoryview(source).nbytes} bytes>"
+    return f"<{type(source).__name__}>"
+
+
+def filename_of(source: ImageSource, index: int) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(os.fspath(source))
+    return f"image{index}"
+
+
+class FilePayload(aiohttp.AsyncIterablePayload):
+    """File streamed in chunks with a known size, so the form is sent with Content-Length."""
+
+    def __init__(self, path: str | os.PathLike, chunk_size: int = CHUNK_SIZE):
+        super().__init__(read_chunks(path, chunk_size))
+        self._size = os.stat(path).st_size
+
+
+def make_payload(source: ImageSource) -> aiohttp.Payload:
+    if isinstance(source, (str, os.PathLike)):
+        return FilePayload(source)
+    if isinstance(source, BUFFER_TYPES):
+        # no copy of the buffer
+        return aiohttp.BytesPayload(source)
+    if is_stream(source):
+        return aiohttp.AsyncIterablePayload(source)
+    raise TypeError(f"Unsupported image source {type(source).__name__}")
+
+
+def make_form(
+    sources: list[ImageSource],
+    filenames: list[str] | None = None,
+) -> aiohttp.MultipartWriter:
+    """Multipart body with one ``uploadfile[]`` part per source."""
+    form = aiohttp.MultipartWriter("form-data")
+    for index, source in enumerate(sources):
+        filename = filenames[index] if filenames else filename_of(source, index)
+        payload = make_payload(source)
+        payload.set_content_disposition(
+            "form-data", name="uploadfile[]", filename=filename
+        )
+        payload.headers["Content-Type"] = "application/octet-stream"
+        form.append_payload(payload)
+    return form
+
+
+class StreamGuard:
+    """Fails a retry that would send an already consumed async stream."""
+
+    def __init__(self, sources: list[ImageSource]):
+        self.streams = [source for source in sources if is_stream(source)]
+        self.sent = False
+
+    def check(self) -> None:
+        if self.sent and self.streams:
+            raise ValueError("Async image stream was already sent and cannot be retried")
+        self.sent = True
+
+
+def _hash_file(path: str | os.PathLike, chunk_size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_buffer(buffer: bytes | bytearray | memoryview) -> str:
+    return hashlib.sha256(buffer).hexdigest()
+
+
+async def content_hash(source: ImageSource, chunk_size: int = CHUNK_SIZE) -> str | None:
+    """
+    sha256 of a source without loading a file into memory.
+
+    Hashing runs in a thread, hashlib releases the GIL for large buffers.
+
+    :return: None for async streams that cannot be read twice
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return await asyncio.to_thread(_hash_file, source, chunk_size)
+    if isinstance(source, BUFFER_TYPES):
+        if memoryview(source).nbytes < INLINE_HASH_SIZE:
+            return _hash_buffer(source)
+        return await asyncio.to_thread(_hash_buffer, source)
+    return None
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable
+
+from .cache import CacheStats, TTLCache
+from .coalescer import RequestCoalescer
+
+
+class BaseUploadStorage(abc.ABC):
+    """Persistent ``key`` to image id mapping behind :class:`UploadCache`."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> tuple[str, float] | None:
+        """
+        :return: image id and seconds it stays valid, None if missing or expired
+        """
+
+    @abc.abstractmethod
+    async def set(self, key: str, image_id: str, ttl: float) -> None:
+        pass
+
+
+class SQLiteUploadStorage(BaseUploadStorage):
+    """Image ids kept in a SQLite database, shared by processes and restarts."""
+
+    def __init__(self, path: str | os.PathLike, timeout: float = 30.0):
+        self.path = str(path)
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS avito_uploaded_images "
+            "(key TEXT PRIMARY KEY, image_id TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> tuple[str, float] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT image_id, expires_at FROM avito_uploaded_images "
+                "WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return (row[0], row[1] - now) if row else None
+
+    def _set(self, key: str, image_id: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM avito_uploaded_images WHERE expires_at < ?", (now,)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO avito_uploaded_images VALUES (?, ?, ?)",
+                (key, image_id, now + ttl),
+            )
+
+    async def get(self, key: str) -> tuple[str, float] | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, image_id: str, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, image_id, ttl)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class UploadCache:
+    """
+    Ids of uploaded images by account and content hash.
+
+    Sending an image that was already uploaded by the account reuses its id
+    instead of uploading it again. Ids live in a bounded in-memory LRU,
+    an optional ``storage`` keeps them across processes and restarts.
+
+    Usage::
+
+        avito = Avito(..., upload_cache=UploadCache(storage=SQLiteUploadStorage("images.db")))
+        await avito.send_image(chat_id, "catalog/1.jpg")  # uploads
+        await avito.send_image(other_chat_id, "catalog/1.jpg")  # only hashes the file
+
+    :param maxsize: max number of ids in memory
+    :param ttl: seconds to reuse an id, keep it below the time Avito keeps
+        uploaded images
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 24 * 3600.0,
+        storage: BaseUploadStorage | None = None,
+    ):
+        self.ttl = ttl
+        self.storage = storage
+        self._ids: TTLCache[str, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._stats = CacheStats()
+        # single flight of uploads, separate from the GET coalescer of the client
+        self._uploads = RequestCoalescer()
+
+    @staticmethod
+    def key(client_id: str | None, digest: str) -> str:
+        return f"{client_id}:{digest}"
+
+    async def get(self, client_id: str | None, digest: str) -> str | None:
+        key = self.key(client_id, digest)
+        image_id = self._ids.get(key)
+        if image_id is None and self.storage is not None:
+            stored = await self.storage.get(key)
+            if stored is not None:
+                # expire together with the stored id, not a full ttl from now
+                image_id, ttl = stored
+                self._ids.set(key, image_id, ttl=min(ttl, self.ttl))
+        if image_id is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return image_id
+
+    async def set(self, client_id: str | None, digest: str, image_id: str) -> None:
+        key = self.key(client_id, digest)
+        self._ids[key] = image_id
+        if self.storage is not None:
+            await self.storage.set(key, image_id, self.ttl)
+
+    async def get_or_upload(
+        self,
+        client_id: str | None,
+        digest: str,
+        upload: Callable[[], Awaitable[str]],
+    ) -> str:
+        """
+        Known id of the image or the id returned by ``upload``.
+
+        Concurrent calls for the same image of the account share one upload.
+        """
+        return await self._uploads.run(
+            self.key(client_id, digest),
+            lambda: self._get_or_upload(client_id, digest, upload),
+        )
+
+    async def _get_or_upload(
+        self,
+        client_id: str | None,
+        digest: str,
+        upload: Callable[[], Awaitable[str]],
+    ) -> str:
+        image_id = await self.get(client_id, digest)
+        if image_id is None:
+            image_id = await upload()
+            await self.set(client_id, digest, image_id)
+        return image_id
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            size=len(self._ids),
+        )
@@ -0,0 +1,30 @@
+from .app import create_app
+from .dedup import BaseDedupStore, DedupProcessor, MemoryDedupStore, SQLiteDedupStore
+from .dispatcher import Dispatcher, HandlerObject
+from .polling import Poller, make_update
+from .processor import (
+    OverflowPolicy,
+    ProcessorStats,
+    QueueProcessor,
+    ShardedProcessor,
+    UpdateProcessor,
+    UpdateRejected,
+)
+
+__all__ = (
+    "create_app",
+    "BaseDedupStore",
+    "DedupProcessor",
+    "MemoryDedupStore",
+    "SQLiteDedupStore",
+    "Dispatcher",
+    "HandlerObject",
+    "make_update",
+    "OverflowPolicy",
+    "Poller",
+    "ProcessorStats",
+    "QueueProcessor",
+    "ShardedProcessor",
+    "UpdateProcessor",
+    "UpdateRejected",
+)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+from aiohttp import web
+from loguru import logger
+from pydantic import ValidationError
+
+from ..avito import Avito
+from ..models import WebhookUpdate
+from ..pool import AvitoPool
+from .processor import UpdateProcessor, UpdateRejected
+
+AVITO_KEY = web.AppKey("avito_clients", object)
+PROCESSOR_KEY = web.AppKey("avito_processor", UpdateProcessor)
+
+
+def _resolver(clients: Avito | AvitoPool | Mapping[str, Avito]):
+    if isinstance(clients, Avito):
+        return {clients.client_id: clients}.get
+
+    def resolve(client_id: str) -> Avito | None:
+        try:
+            return clients[client_id]
+        except KeyError:
+            return None
+
+    return resolve
+
+
+def create_app(
+    clients: Avito | AvitoPool | Mapping[str, Avito],
+    processor: UpdateProcessor,
+    path: str = "/api/webhook/{client_id}",
+    app: web.Application | None = None,
+) -> web.Application:
+    """
+    Application receiving Avito webhooks.
+
+    Updates are decoded, bound to the client of the ``client_id`` route part
+    and handed to ``processor``; the reply is sent without waiting for handlers.
+    The processor is started and stopped with the application.
+
+    Replies 404 for an unknown ``client_id``, 400 for a malformed update
+    and 503 when the processor rejects it.
+
+    :param clients: a client, a pool or clients by ``client_id``
+    :param path: route, must contain ``{client_id}``
+    :param app: add the route to an existing application
+    """
+    resolve = _resolver(clients)
+
+    async def webhook(request: web.Request) -> web.Response:
+        client_id = request.match_info["client_id"]
+        avito = resolve(client_id)
+        if avito is None:
+            logger.warning(f"Webhook for unknown account {client_id}")
+            raise web.HTTPNotFound()
+        body = await request.read()
+        try:
+            update = WebhookUpdate.model_validate_json(body, context={"avito": avito})
+        except ValidationError as e:
+            logger.warning(f"Bad webhook update [{client_id}]: {e}")
+            raise web.HTTPBadRequest()
+        try:
+            await processor.submit(update)
+        except UpdateRejected as e:
+            logger.warning(f"Webhook update {update.id} rejected: {e}")
+            raise web.HTTPServiceUnavailable()
+        return web.Response(text="OK")
+
+    async def on_startup(_: web.Application) -> None:
+        await processor.start()
+
+    async def on_cleanup(_: web.Application) -> None:
+        await processor.stop()
+
+    app = app or web.Application()
+    app[AVITO_KEY] = clients
+    app[PROCESSOR_KEY] = processor
+    app.router.add_post(path, webhook)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
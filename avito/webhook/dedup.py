@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+from ..cache import TTLCache
+from ..models import WebhookUpdate
+from .processor import UpdateProcessor
+
+
+class BaseDedupStore(abc.ABC):
+    """Set of recently seen ``WebhookUpdate.id`` values."""
+
+    @abc.abstractmethod
+    async def seen(self, key: str) -> bool:
+        """
+        Mark ``key`` as seen.
+
+        :return: True if it was already seen and not expired
+        """
+
+    @abc.abstractmethod
+    async def forget(self, key: str) -> None:
+        """Unmark ``key`` so that a redelivered update is processed."""
+
+
+class MemoryDedupStore(BaseDedupStore):
+    """
+    Dedup within one process, bounded LRU with time to live.
+
+    :param maxsize: max number of remembered ids
+    :param ttl: seconds to remember an id, Avito retries within minutes
+    """
+
+    def __init__(self, maxsize: int = 100_000, ttl: float | None = 3600.0):
+        self._ids: TTLCache[str, None] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def seen_nowait(self, key: str) -> bool:
+        if key in self._ids:
+            return True
+        self._ids[key] = None
+        return False
+
+    async def seen(self, key: str) -> bool:
+        return self.seen_nowait(key)
+
+    async def forget(self, key: str) -> None:
+        self._ids.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class SQLiteDedupStore(BaseDedupStore):
+    """
+    Dedup shared by processes on one host through a SQLite database.
+
+    Check and mark is a single upsert, so concurrent receivers agree on
+    which of them processes an update. Expired ids are deleted every
+    ``cleanup_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        ttl: float = 3600.0,
+        cleanup_interval: float = 60.0,
+        timeout: float = 30.0,
+    ):
+        self.path = str(path)
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        # one connection, dedup runs on every update
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # losing the last ids on power failure only risks a duplicate
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS avito_webhook_updates "
+            "(id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._cleaned_at = 0.0
+
+    def _seen(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            if now - self._cleaned_at > self.cleanup_interval:
+                self._cleaned_at = now
+                self._conn.execute(
+                    "DELETE FROM avito_webhook_updates WHERE expires_at < ?", (now,)
+                )
+            cursor = self._conn.execute(
+                "INSERT INTO avito_webhook_updates (id, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET expires_at = excluded.expires_at "
+                "WHERE avito_webhook_updates.expires_at < ?",
+                (key, now + self.ttl, now),
+            )
+            return cursor.rowcount == 0
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM avito_webhook_updates WHERE id = ?", (key,))
+
+    async def seen(self, key: str) -> bool:
+        return await asyncio.to_thread(self._seen, key)
+
+    async def forget(self, key: str) -> None:
+        await asyncio.to_thread(self._forget, key)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class DedupProcessor(UpdateProcessor):
+    """
+    Processor skipping updates with an already seen ``WebhookUpdate.id``.
+
+    Ids live in a local :class:`MemoryDedupStore`, an optional ``shared``
+    store is asked only about ids new to this process.
+    An id whose check or submit fails, e.g. rejected by the wrapped processor
+    or cancelled, is forgotten, so Avito's redelivery is processed.
+
+    Usage::
+
+        processor = DedupProcessor(
+            ShardedProcessor(dp), shared=SQLiteDedupStore("updates.db")
+        )
+        app = create_app(pool, processor)
+    """
+
+    def __init__(
+        self,
+        processor: UpdateProcessor,
+        local: MemoryDedupStore | None = None,
+        shared: BaseDedupStore | None = None,
+    ):
+        self.processor = processor
+        self.local = local or MemoryDedupStore()
+        self.shared = shared
+        self.duplicates = 0
+
+    async def _seen(self, key: str) -> bool:
+        if self.local.seen_nowait(key):
+            return True
+        if self.shared is not None and await self.shared.seen(key):
+            return True
+        return False
+
+    async def _forget(self, key: str) -> None:
+        await self.local.forget(key)
+        if self.shared is not None:
+            try:
+                await self.shared.forget(key)
+            except Exception as e:
+                logger.warning(f"Failed to forget webhook update {key}: {e}")
+
+    async def submit(self, update: WebhookUpdate) -> None:
+        try:
+            if await self._seen(update.id):
+                self.duplicates += 1
+                logger.debug(f"Duplicate webhook update {update.id}")
+                return
+            await self.processor.submit(update)
+        except BaseException:
+            await self._forget(update.id)
+            raise
+
+    async def start(self) -> None:
+        await self.processor.start()
+
+    async def stop(self) -> None:
+        await self.processor.stop()
+
+    async def __aenter__(self) -> DedupProcessor:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
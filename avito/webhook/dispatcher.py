@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+
+from loguru import logger
+
+from ..models import MessageType, WebhookMessage, WebhookUpdate
+
+Handler = Callable[[WebhookMessage], Awaitable[Any]]
+Filter = Callable[[WebhookMessage], bool | Awaitable[bool]]
+
+
+def _as_set(value: str | Iterable[str] | None) -> frozenset[str] | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return frozenset((value,))
+    return frozenset(value)
+
+
+@dataclass(slots=True)
+class HandlerObject:
+    """Registered handler with its filters."""
+
+    callback: Handler
+    types: frozenset[str] | None = None
+    chat_types: frozenset[str] | None = None
+    from_self: bool | None = None
+    filters: tuple[Filter, ...] = field(default_factory=tuple)
+
+    async def check(self, message: WebhookMessage) -> bool:
+        if self.types is not None and message.type not in self.types:
+            return False
+        if self.chat_types is not None and message.chat_type not in self.chat_types:
+            return False
+        if self.from_self is not None and message.from_self() != self.from_self:
+            return False
+        for check in self.filters:
+            result = check(message)
+            if inspect.isawaitable(result):
+                result = await result
+            if not result:
+                return False
+        return True
+
+
+class Dispatcher:
+    """
+    Registry of webhook message handlers.
+
+    An update goes to the first handler whose filters all match,
+    handlers are checked in registration order.
+
+    Usage::
+
+        dp = Dispatcher()
+
+        @dp.message(types=MessageType.TEXT, chat_types="u2i", from_self=False)
+        async def on_text(message: WebhookMessage):
+            await message.read_message_chat()
+            await message.answer("Hello")
+    """
+
+    def __init__(self):
+        self.handlers: list[HandlerObject] = []
+
+    def register(
+        self,
+        callback: Handler,
+        *filters: Filter,
+        types: MessageType | str | Iterable[MessageType | str] | None = None,
+        chat_types: str | Iterable[str] | None = None,
+        from_self: bool | None = None,
+    ) -> Handler:
+        """
+        :param filters: extra checks of a message, sync or async
+        :param types: accepted message types
+        :param chat_types: accepted chat types, e.g. ``u2i`` or ``u2u``
+        :param from_self: True for own messages only, False for incoming only
+        """
+        self.handlers.append(
+            HandlerObject(
+                callback=callback,
+                types=_as_set(types),
+                chat_types=_as_set(chat_types),
+                from_self=from_self,
+                filters=filters,
+            )
+        )
+        return callback
+
+    def message(self, *filters: Filter, **kwargs) -> Callable[[Handler], Handler]:
+        """Decorator version of :meth:`register`."""
+
+        def decorator(callback: Handler) -> Handler:
+            return self.register(callback, *filters, **kwargs)
+
+        return decorator
+
+    async def feed_update(self, update: WebhookUpdate) -> bool:
+        """
+        Run the matching handler.
+
+        :return: False when no handler matched
+        """
+        message = update.message
+        for handler in self.handlers:
+            if await handler.check(message):
+                await handler.callback(message)
+                return True
+        logger.debug(f"Webhook update {update.id} not handled")
+        return False
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+from loguru import logger
+
+from ..avito import Avito
+from ..methods import GetChats, GetMessages
+from ..models import (
+    Chat,
+    Message,
+    WebhookMessage,
+    WebhookPayload,
+    WebhookUpdate,
+)
+from ..pool import AvitoPool
+from .processor import UpdateProcessor, UpdateRejected
+
+POLLING_VERSION = "polling"
+
+
+def make_update(chat: Chat, message: Message, user_id: int, avito: Avito) -> WebhookUpdate:
+    """WebhookUpdate of a message fetched with the API."""
+    value = WebhookMessage(
+        author_id=message.author_id,
+        chat_id=chat.id,
+        chat_type=chat.id.split("-", 1)[0],
+        content=message.content,
+        created=message.created,
+        id=message.id,
+        item_id=chat.context.value.id,
+        read=message.read,
+        type=message.type,
+        user_id=user_id,
+    ).as_(avito)
+    # message id keeps redelivery dedup working across pollers
+    return WebhookUpdate(
+        id=message.id,
+        payload=WebhookPayload(type="message", value=value).as_(avito),
+        timestamp=message.created,
+        version=POLLING_VERSION,
+    ).as_(avito)
+
+
+@dataclass(slots=True)
+class ChatCursor:
+    """
+    Seen messages of a chat.
+
+    Messages created before ``floor`` are old, ids of newer ones are kept
+    so that a message listed late within ``overlap`` seconds of the newest
+    seen one is still emitted once.
+    """
+
+    floor: int
+    overlap: int = 0
+    created: int = 0
+    ids: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.created = max(self.created, self.floor)
+
+    def is_new(self, message: Message) -> bool:
+        return message.created >= self.floor and message.id not in self.ids
+
+    def advance(self, message: Message) -> None:
+        self.ids[message.id] = message.created
+        if message.created > self.created:
+            self.created = message.created
+            self.floor = max(self.floor, message.created - self.overlap)
+            self.ids = {
+                message_id: created
+                for message_id, created in self.ids.items()
+                if created >= self.floor
+            }
+
+
+@dataclass(slots=True)
+class AccountState:
+    # newest Chat.updated seen, None until the first poll
+    since: int | None
+    interval: float
+    chats: dict[str, ChatCursor] = field(default_factory=dict)
+    polls: int = 0
+    updates: int = 0
+
+
+class Poller:
+    """
+    Update source for environments without a public webhook url.
+
+    Chats of every account are polled incrementally: only chats with
+    ``Chat.updated`` within ``overlap`` seconds of the newest one seen are
+    looked at, and only their messages not seen yet are emitted, oldest first,
+    as :class:`WebhookUpdate` to ``processor``. Only server timestamps are
+    compared, so the local clock does not matter. History before the first
+    poll is skipped.
+
+    The interval of an account is reset to ``min_interval`` after a poll
+    with new messages and grows ``backoff`` times up to ``max_interval``
+    after an idle one, so an idle account costs one small GetChats call
+    per ``max_interval``.
+
+    Usage::
+
+        async with Poller(pool, ShardedProcessor(dp)):
+            await asyncio.Future()
+
+    :param clients: a client, a pool or clients by ``client_id``
+    :param page_size: chats and messages per request
+    :param history: fetch all new messages of a chat, otherwise emit only
+        ``Chat.last_message`` and save a GetMessages call per active chat
+    :param overlap: seconds to look back behind the newest seen ``Chat.updated``,
+        messages listed later than that after their creation are lost;
+        chats updated within it are listed again on every poll
+    :param concurrency: max accounts polled at once
+    """
+
+    def __init__(
+        self,
+        clients: Avito | AvitoPool | Mapping[str, Avito],
+        processor: UpdateProcessor,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        page_size: int = 20,
+        history: bool = True,
+        concurrency: int = 10,
+        chat_types: str | None = None,
+        overlap: int = 30,
+    ):
+        self.clients = clients
+        self.processor = processor
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.page_size = page_size
+        self.history = history
+        self.chat_types = chat_types
+        self.overlap = overlap
+        self.accounts: dict[str, AccountState] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: list[asyncio.Task] = []
+
+    def _client_ids(self) -> Iterable[str]:
+        if isinstance(self.clients, Avito):
+            return (self.clients.client_id,)
+        if isinstance(self.clients, AvitoPool):
+            return self.clients.client_ids
+        return self.clients.keys()
+
+    def _client(self, client_id: str) -> Avito:
+        if isinstance(self.clients, Avito):
+            return self.clients
+        return self.clients[client_id]
+
+    async def _new_chats(
+        self, avito: Avito, user_id: int, since: int | None
+    ) -> list[Chat]:
+        """Chats updated at ``since`` or later, by default within ``overlap`` of the newest."""
+        # chats come most recently updated first
+        chats: list[Chat] = []
+        offset = 0
+        while True:
+            page = await avito(
+                GetChats(
+                    user_id=user_id,
+                    chat_types=self.chat_types,
+                    limit=self.page_size,
+                    offset=offset,
+                )
+            )
+            for chat in page.chats:
+                if since is None:
+                    since = chat.updated - self.overlap
+                if chat.updated < since:
+                    return chats
+                chats.append(chat)
+            if len(page.chats) < self.page_size:
+                return chats
+            offset += self.page_size
+
+    async def _new_messages(
+        self, avito: Avito, user_id: int, chat: Chat, cursor: ChatCursor
+    ) -> list[Message]:
+        if not cursor.is_new(chat.last_message):
+            return []
+        if not self.history:
+            return [chat.last_message]
+        # messages come newest first
+        messages: list[Message] = []
+        offset = 0
+        while True:
+            page = await avito(
+                GetMessages(
+                    user_id=user_id,
+                    chat_id=chat.id,
+                    limit=self.page_size,
+                    offset=offset,
+                )
+            )
+            for message in page.messages:
+                if message.created < cursor.floor:
+                    return messages[::-1]
+                if cursor.is_new(message):
+                    messages.append(message)
+            if not page.meta.has_more:
+                return messages[::-1]
+            offset += self.page_size
+
+    async def poll(self, client_id: str) -> int:
+        """
+        Poll one account once.
+
+        :return: number of emitted updates
+        """
+        state = self.accounts[client_id]
+        avito = self._client(client_id)
+        user_id = await avito.resolve_user_id()
+        priming = state.since is None
+        window = None if priming else state.since - self.overlap
+        chats = await self._new_chats(avito, user_id, window)
+        emitted = 0
+        for chat in chats:
+            cursor = state.chats.get(chat.id)
+            if priming:
+                # history before the first poll is skipped
+                cursor = state.chats[chat.id] = ChatCursor(
+                    chat.last_message.created, self.overlap
+                )
+                cursor.advance(chat.last_message)
+                continue
+            if cursor is None:
+                cursor = state.chats[chat.id] = ChatCursor(window, self.overlap)
+            for message in await self._new_messages(avito, user_id, chat, cursor):
+                await self.processor.submit(make_update(chat, message, user_id, avito))
+                cursor.advance(message)
+                emitted += 1
+        state.since = max([state.since or 0, *(chat.updated for chat in chats)])
+        # a chat quiet for the whole overlap gets a fresh cursor at the window start
+        # when it is listed again, newer than anything the dropped one has seen
+        window = state.since - self.overlap
+        state.chats = {
+            chat_id: cursor
+            for chat_id, cursor in state.chats.items()
+            if cursor.created >= window
+        }
+        state.polls += 1
+        state.updates += emitted
+        return emitted
+
+    def _next_interval(self, state: AccountState, emitted: int) -> float:
+        if emitted:
+            return self.min_interval
+        return min(state.interval * self.backoff, self.max_interval)
+
+    async def _run(self, client_id: str) -> None:
+        state = self.accounts[client_id]
+        while True:
+            emitted = 0
+            try:
+                async with self._semaphore:
+                    emitted = await self.poll(client_id)
+            except asyncio.CancelledError:
+                raise
+            except UpdateRejected as e:
+                # cursors stop at the rejected message, retry soon
+                logger.warning(f"Polling [{client_id}] paused: {e}")
+                emitted = 1
+            except Exception:
+                logger.exception(f"Polling [{client_id}] failed")
+            state.interval = self._next_interval(state, emitted)
+            await asyncio.sleep(state.interval)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        await self.processor.start()
+        for client_id in self._client_ids():
+            self.accounts.setdefault(
+                client_id, AccountState(since=None, interval=self.min_interval)
+            )
+            self._tasks.append(asyncio.create_task(self._run(client_id)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.processor.stop()
+
+    async def __aenter__(self) -> Poller:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import time
+import zlib
+from dataclasses import dataclass, replace
+from enum import StrEnum
+
+from loguru import logger
+
+from ..models import WebhookUpdate
+from .dispatcher import Dispatcher
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with an update when the queue is full."""
+
+    BLOCK = "block"
+    """Wait for a free slot, the HTTP reply waits too."""
+    DROP_NEW = "drop_new"
+    """Acknowledge and drop the incoming update."""
+    DROP_OLDEST = "drop_oldest"
+    """Drop the oldest queued update to make room."""
+    REJECT = "reject"
+    """Reply 503 so that Avito delivers the update again later."""
+
+
+class UpdateRejected(Exception):
+    """Update was not accepted by the processor."""
+
+
+@dataclass
+class ProcessorStats:
+    """
+    Counters of a processor.
+
+    Lag is the delay between ``WebhookUpdate.timestamp`` and the start
+    of processing, in seconds.
+    """
+
+    depth: int = 0
+    processed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    lag_last: float = 0.0
+    lag_max: float = 0.0
+    lag_total: float = 0.0
+
+    @property
+    def lag_avg(self) -> float:
+        handled = self.processed + self.failed
+        return self.lag_total / handled if handled else 0.0
+
+    def add_lag(self, lag: float) -> None:
+        self.lag_last = lag
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+
+    def __add__(self, other: ProcessorStats) -> ProcessorStats:
+        return ProcessorStats(
+            depth=self.depth + other.depth,
+            processed=self.processed + other.processed,
+            failed=self.failed + other.failed,
+            dropped=self.dropped + other.dropped,
+            rejected=self.rejected + other.rejected,
+            lag_last=max(self.lag_last, other.lag_last),
+            lag_max=max(self.lag_max, other.lag_max),
+            lag_total=self.lag_total + other.lag_total,
+        )
+
+
+class UpdateProcessor(abc.ABC):
+    """Receiver of webhook updates decoupled from the HTTP reply."""
+
+    @abc.abstractmethod
+    async def submit(self, update: WebhookUpdate) -> None:
+        """
+        Accept an update for processing.
+
+        :raise UpdateRejected: the update must be delivered again
+        """
+
+    @abc.abstractmethod
+    async def start(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def stop(self) -> None:
+        pass
+
+
+class QueueProcessor(UpdateProcessor):
+    """
+    Bounded in-process queue of updates served by ``workers`` tasks
+    that feed them to the dispatcher.
+
+    :param maxsize: queue capacity, 0 means unbounded
+    :param overflow: behaviour when the queue is full
+    :param drain_timeout: seconds :meth:`stop` waits for queued updates
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        maxsize: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        workers: int = 1,
+        drain_timeout: float | None = 10.0,
+    ):
+        self.dispatcher = dispatcher
+        self.overflow = OverflowPolicy(overflow)
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.queue: asyncio.Queue[WebhookUpdate] = asyncio.Queue(maxsize)
+        self._stats = ProcessorStats()
+        self._tasks: list[asyncio.Task] = []
+
+    async def submit(self, update: WebhookUpdate) -> None:
+        if self.overflow is OverflowPolicy.BLOCK:
+            await self.queue.put(update)
+            return
+        if self.queue.full():
+            if self.overflow is OverflowPolicy.REJECT:
+                self._stats.rejected += 1
+                raise UpdateRejected(f"Update queue is full ({self.queue.maxsize})")
+            self._stats.dropped += 1
+            if self.overflow is OverflowPolicy.DROP_NEW:
+                logger.warning(f"Update queue is full, dropped update {update.id}")
+                return
+            dropped = self.queue.get_nowait()
+            self.queue.task_done()
+            logger.warning(f"Update queue is full, dropped update {dropped.id}")
+        self.queue.put_nowait(update)
+
+    async def process(self, update: WebhookUpdate) -> None:
+        self._stats.add_lag(max(time.time() - update.timestamp, 0.0))
+        try:
+            await self.dispatcher.feed_update(update)
+        except Exception:
+            self._stats.failed += 1
+            logger.exception(f"Failed to process update {update.id}")
+        else:
+            self._stats.processed += 1
+
+    def stats(self) -> ProcessorStats:
+        return replace(self._stats, depth=self.queue.qsize())
+
+    async def _worker(self) -> None:
+        while True:
+            update = await self.queue.get()
+            try:
+                await self.process(update)
+            finally:
+                self.queue.task_done()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopped with {self.queue.qsize()} unprocessed updates")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def __aenter__(self) -> QueueProcessor:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+
+class ShardedProcessor(UpdateProcessor):
+    """
+    Updates spread over ``lanes`` queues by ``chat_id``, each served by one task.
+
+    Chats are processed in parallel while updates of one chat keep their
+    order, so replies and ``ChatRead`` calls of a chat never race.
+
+    :param lane_maxsize: queue capacity of a lane, 0 means unbounded
+    :param overflow: behaviour when the lane of an update is full
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        lanes: int = 8,
+        lane_maxsize: int = 100,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        drain_timeout: float | None = 10.0,
+    ):
+        if lanes < 1:
+            raise ValueError("lanes must be positive")
+        self.dispatcher = dispatcher
+        self.lanes = [
+            QueueProcessor(
+                dispatcher,
+                maxsize=lane_maxsize,
+                overflow=overflow,
+                workers=1,
+                drain_timeout=drain_timeout,
+            )
+            for _ in range(lanes)
+        ]
+
+    def lane_of(self, update: WebhookUpdate) -> QueueProcessor:
+        # crc32 is stable across processes unlike hash() of str
+        key = zlib.crc32(update.message.chat_id.encode())
+        return self.lanes[key % len(self.lanes)]
+
+    async def submit(self, update: WebhookUpdate) -> None:
+        await self.lane_of(update).submit(update)
+
+    async def start(self) -> None:
+        for lane in self.lanes:
+            await lane.start()
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(lane.stop() for lane in self.lanes))
+
+    def lane_stats(self) -> list[ProcessorStats]:
+        return [lane.stats() for lane in self.lanes]
+
+    def stats(self) -> ProcessorStats:
+        """Totals over all lanes, ``lag_last`` and ``lag_max`` are the worst lane."""
+        return sum(self.lane_stats(), ProcessorStats())
+
+    async def __aenter__(self) -> ShardedProcessor:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
@@ -0,0 +1,50 @@
+"""
+Memory per message/chat: full pydantic models vs compact records.
+
+Measured with tracemalloc as memory still allocated after decoding
+a response body and building the batch from it.
+
+    python benchmarks/bench_compact.py
+"""
+import gc
+import tracemalloc
+
+import orjson
+
+from avito.models import Chat, Message
+from avito.schema.messenger.models import compact_chats, compact_messages
+from payloads import chat, message
+
+
+def retained(build, body: bytes, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objects = build(orjson.loads(body))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main():
+    count = 20_000
+    body = orjson.dumps([message(i) for i in range(count)])
+    print(f"Message x{count}")
+    full = retained(lambda data: [Message.model_validate(m) for m in data], body, count)
+    compact = retained(compact_messages, body, count)
+    print(f"  {'Message':>14}: {full:8.0f} bytes/message")
+    print(f"  {'CompactMessage':>14}: {compact:8.0f} bytes/message")
+
+    count = 5_000
+    # chats of the same two hundred buyers, as in a real inbox
+    body = orjson.dumps([chat(i % 200) | {"id": f"u2i-{i}"} for i in range(count)])
+    print(f"Chat x{count}")
+    full = retained(lambda data: [Chat.model_validate(c) for c in data], body, count)
+    compact = retained(compact_chats, body, count)
+    print(f"  {'Chat':>14}: {full:8.0f} bytes/chat")
+    print(f"  {'CompactChat':>14}: {compact:8.0f} bytes/chat")
+
+
+if __name__ == "__main__":
+    main()
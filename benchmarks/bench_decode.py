@@ -0,0 +1,50 @@
+"""
+Decoding of Messages and Chats pages.
+
+Compares the former two-pass path (``orjson.loads`` + ``model_validate``)
+with ``AvitoMethod.decode_response`` validating straight from bytes.
+
+    python benchmarks/bench_decode.py
+"""
+import timeit
+import tracemalloc
+
+import orjson
+
+from avito.methods import GetChats, GetMessages
+from payloads import chats_page, messages_page
+
+
+def two_pass(method, body):
+    return method.__returning__.model_validate(orjson.loads(body), context={"avito": None})
+
+
+def single_pass(method, body):
+    return method.decode_response(body, context={"avito": None})
+
+
+def peak_memory(func, *args) -> int:
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    cases = (
+        ("Messages x1000", GetMessages, orjson.dumps(messages_page(1000))),
+        ("Chats x100", GetChats, orjson.dumps(chats_page(100))),
+    )
+    for name, method, body in cases:
+        print(f"{name} ({len(body) / 1024:.0f} KiB)")
+        for label, func in (("two-pass", two_pass), ("single-pass", single_pass)):
+            func(method, body)
+            seconds = min(timeit.repeat(lambda: func(method, body), number=20, repeat=5)) / 20
+            peak = peak_memory(func, method, body)
+            print(f"  {label:>12}: {seconds * 1000:8.2f} ms  peak {peak / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cost of a webhook dedup check with millions of remembered ids.
+
+    python benchmarks/bench_dedup.py
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from avito.webhook import MemoryDedupStore, SQLiteDedupStore
+
+LOOKUPS = 200_000
+
+
+def bench_memory(size: int) -> None:
+    ids = [str(uuid.uuid4()) for _ in range(size)]
+    tracemalloc.start()
+    store = MemoryDedupStore(maxsize=size, ttl=3600)
+    for key in ids:
+        store.seen_nowait(key)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    hits = ids[-LOOKUPS:]
+    started = time.perf_counter()
+    for key in hits:
+        store.seen_nowait(key)
+    hit = (time.perf_counter() - started) / len(hits)
+
+    new = [str(uuid.uuid4()) for _ in range(LOOKUPS)]
+    started = time.perf_counter()
+    for key in new:
+        store.seen_nowait(key)
+    miss = (time.perf_counter() - started) / len(new)
+    print(
+        f"memory {size:>9,} ids: hit {hit * 1e9:6.0f} ns, "
+        f"new with eviction {miss * 1e9:6.0f} ns, {memory / size:.0f} B/id"
+    )
+
+
+async def bench_sqlite(size: int, lookups: int = 5000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteDedupStore(os.path.join(directory, "dedup.db"))
+        ids = [str(uuid.uuid4()) for _ in range(size)]
+        store._conn.execute("BEGIN")
+        store._conn.executemany(
+            "INSERT INTO avito_webhook_updates VALUES (?, ?)",
+            ((key, time.time() + 3600) for key in ids),
+        )
+        store._conn.execute("COMMIT")
+        started = time.perf_counter()
+        await store.seen(ids[0])  # first call deletes expired ids
+        for key in ids[:lookups]:
+            await store.seen(key)
+        per_call = (time.perf_counter() - started) / lookups
+        store.close()
+    print(f"sqlite {size:>9,} ids: seen() {per_call * 1e6:6.1f} us")
+
+
+def main():
+    for size in (100_000, 1_000_000, 3_000_000):
+        bench_memory(size)
+    asyncio.run(bench_sqlite(1_000_000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Per-call cost of request/response logging when DEBUG is disabled.
+
+Compares eager ``f"{pformat(data)}"`` logging with the lazy records
+emitted by ``Avito._actual_call``.
+
+    python benchmarks/bench_logging.py
+"""
+import sys
+import timeit
+from pprint import pformat
+
+from loguru import logger
+
+from avito.log import RequestLogConfig
+
+PAYLOAD = {
+    "messages": [
+        {
+            "author_id": 237569507,
+            "content": {"text": f"Message {i} " * 10},
+            "created": 1707486141 + i,
+            "direction": "in",
+            "id": f"{i:032x}",
+            "isRead": True,
+            "type": "text",
+        }
+        for i in range(100)
+    ],
+    "meta": {"has_more": True},
+}
+URL = "https://api.avito.ru/messenger/v3/accounts/1/chats/u2i-x/messages/"
+
+
+def eager():
+    logger.debug(f"Response [client] : 200 {pformat(PAYLOAD)}")
+
+
+def lazy(config=RequestLogConfig()):
+    logger.log(
+        config.level,
+        "Response [{}]: {} {} 200 {:.1f}ms {}",
+        "client",
+        "GET",
+        URL,
+        1.0,
+        config.body(PAYLOAD, config.sample()),
+    )
+
+
+def main():
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    number = 2000
+    for name, func in (("eager pformat", eager), ("lazy", lazy)):
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name:>14}: {seconds / number * 1e6:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Upload size and time of large phone-like JPEGs with and without preprocessing.
+
+Requires Pillow. Upload time is estimated for ``UPLINK_MBIT``.
+
+    python benchmarks/bench_preprocess.py
+"""
+import asyncio
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import Image
+
+from avito.preprocess import ImagePreprocessor, PreprocessConfig
+
+IMAGES = 8
+SIZE = (4032, 3024)
+UPLINK_MBIT = 20
+
+
+def make_photo(seed: int) -> bytes:
+    noise = Image.effect_noise(SIZE, 30 + seed).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(SIZE).convert("RGB")
+    buffer = io.BytesIO()
+    Image.blend(noise, gradient, 0.6).save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+async def loop_lag(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        worst = max(worst, time.perf_counter() - started - 0.005)
+    return worst
+
+
+async def run(name: str, preprocessor: ImagePreprocessor, paths: list[str]) -> None:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(loop_lag(stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*map(preprocessor.process, paths))
+    seconds = time.perf_counter() - started
+    stop.set()
+    size = sum(len(result) for result in results)
+    upload = size * 8 / UPLINK_MBIT / 1e6
+    print(
+        f"{name:>10}: {size / 1024 / 1024:6.1f} MiB, prepare {seconds:5.2f}s, "
+        f"upload ~{upload:5.1f}s, max loop lag {await lag * 1000:5.1f} ms"
+    )
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(IMAGES):
+            path = os.path.join(directory, f"photo{index}.jpg")
+            with open(path, "wb") as file:
+                file.write(make_photo(index))
+            paths.append(path)
+        original = sum(map(os.path.getsize, paths))
+        print(f"{IMAGES} photos {SIZE[0]}x{SIZE[1]}, uplink {UPLINK_MBIT} Mbit/s")
+        print(
+            f"{'original':>10}: {original / 1024 / 1024:6.1f} MiB, "
+            f"upload ~{original * 8 / UPLINK_MBIT / 1e6:5.1f}s"
+        )
+        config = PreprocessConfig(max_side=2048, quality=85)
+        with ThreadPoolExecutor(os.cpu_count()) as threads:
+            await run("threads", ImagePreprocessor(config, threads), paths)
+        with ProcessPoolExecutor() as processes:
+            await run("processes", ImagePreprocessor(config, processes), paths)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+"""
+Full vs projected decoding of a large Chats page.
+
+    python benchmarks/bench_projection.py
+"""
+import timeit
+
+import orjson
+
+from avito.base.projection import prefixed
+from avito.methods import GetChats
+from payloads import chats_page
+
+PROJECTION = prefixed("chats", {"id", "updated", "last_message.created", "users.id"})
+
+
+def main():
+    body = orjson.dumps(chats_page(1000))
+    print(f"Chats x1000 ({len(body) / 1024 / 1024:.1f} MiB)")
+    cases = (
+        ("validated", {}),
+        ("trusted", {"trusted": True}),
+        ("projected", {"projection": PROJECTION}),
+    )
+    for label, kwargs in cases:
+        def decode():
+            return GetChats.decode_response(body, {"avito": None}, **kwargs)
+
+        decode()
+        seconds = min(timeit.repeat(decode, number=3, repeat=3)) / 3
+        print(f"  {label:>10}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Validated vs trusted decoding of large Messages and Chats pages.
+
+    python benchmarks/bench_trusted.py
+"""
+import timeit
+
+import orjson
+
+from avito.methods import GetChats, GetMessages
+from payloads import chats_page, messages_page
+
+
+def main():
+    cases = (
+        ("Messages x10000", GetMessages, orjson.dumps(messages_page(10_000))),
+        ("Chats x1000", GetChats, orjson.dumps(chats_page(1000))),
+    )
+    for name, method, body in cases:
+        print(f"{name} ({len(body) / 1024 / 1024:.1f} MiB)")
+        for trusted in (False, True):
+            def decode():
+                return method.decode_response(body, {"avito": None}, trusted=trusted)
+
+            decode()
+            seconds = min(timeit.repeat(decode, number=3, repeat=3)) / 3
+            label = "trusted" if trusted else "validated"
+            print(f"  {label:>10}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Synthetic Avito responses shared by benchmarks."""
+
+AVATAR = {
+    size: f"https://static.avito.ru/avatar/social/{size}/5046178785.jpg"
+    for size in (
+        "128x128", "192x192", "24x24", "256x256", "36x36",
+        "48x48", "64x64", "72x72", "96x96",
+    )
+}
+
+
+def message(i: int) -> dict:
+    return {
+        "author_id": 237569507 + i % 2,
+        "content": {"text": f"Здравствуйте! Товар ещё продаётся? #{i}"},
+        "created": 1707486141 + i,
+        "direction": "in" if i % 2 else "out",
+        "id": f"{i:032x}",
+        "isRead": True,
+        "read": 1707486200 + i,
+        "type": "text",
+    }
+
+
+def user(user_id: int, item_id: int) -> dict:
+    return {
+        "id": user_id,
+        "name": f"User {user_id}",
+        "public_user_profile": {
+            "avatar": AVATAR,
+            "item_id": item_id,
+            "url": f"https://www.avito.ru/user/{user_id}/profile",
+            "user_id": user_id,
+        },
+    }
+
+
+def chat(i: int) -> dict:
+    item_id = 3749321767 + i
+    return {
+        "context": {
+            "type": "item",
+            "value": {
+                "id": item_id,
+                "images": {
+                    "count": 3,
+                    "main": {"140x105": f"https://00.img.avito.st/140x105/{item_id}.jpg"},
+                },
+                "price_string": "12 000 ₽",
+                "status_id": 1,
+                "title": f"Велосипед {i}",
+                "url": f"https://www.avito.ru/moskva/velosipedy/{item_id}",
+                "user_id": 370440487,
+            },
+        },
+        "created": 1707400000 + i,
+        "id": f"u2i-eaK3A2JW1iRBkCS~{i:06d}",
+        "last_message": message(i),
+        "updated": 1707486141 + i,
+        "users": [user(370440487, item_id), user(237569507 + i, item_id)],
+    }
+
+
+def messages_page(count: int = 100) -> dict:
+    return {"messages": [message(i) for i in range(count)], "meta": {"has_more": True}}
+
+
+def chats_page(count: int = 100) -> dict:
+    return {"chats": [chat(i) for i in range(count)]}
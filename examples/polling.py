@@ -0,0 +1,36 @@
+import asyncio
+import os
+
+from loguru import logger
+
+from avito import Avito
+from avito.models import MessageType, WebhookMessage
+from avito.webhook import Dispatcher, Poller, ShardedProcessor
+
+CLIENT_ID = os.getenv("CLIENT_ID")
+CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+TOKEN = os.getenv("TOKEN", None)
+
+dp = Dispatcher()
+
+
+@dp.message(types=MessageType.TEXT, from_self=False)
+async def on_text(message: WebhookMessage):
+    logger.info(f"Message from user: {message.content.text}")
+    await message.read_message_chat()
+    await message.answer("Hello, I'm a bot")
+
+
+async def main():
+    avito = Avito(
+        client_id=CLIENT_ID,
+        client_secret=CLIENT_SECRET,
+        token=TOKEN,
+    )
+    # same handlers as with a webhook, without a public url
+    async with Poller(avito, ShardedProcessor(dp), min_interval=2, max_interval=60):
+        await asyncio.Future()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
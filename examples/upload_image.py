@@ -17,6 +17,10 @@ async def main():
         image = await avito.send_image(chat_id, str(image_path.resolve().absolute()))
         print(image)
 
+        # several images in one request, from a path and from memory
+        image_ids = await avito.upload_images([image_path, image_path.read_bytes()])
+        print(image_ids)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
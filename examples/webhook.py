@@ -1,12 +1,12 @@
 import asyncio
 import os
-from pprint import pformat
 
 from aiohttp import web
 from loguru import logger
 
 from avito import Avito
-from avito.models import WebhookUpdate
+from avito.models import MessageType, WebhookMessage
+from avito.webhook import Dispatcher, OverflowPolicy, QueueProcessor, create_app
 
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 
@@ -14,49 +14,46 @@ CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 TOKEN = os.getenv("TOKEN", None)
 
-routes = web.RouteTableDef()
+dp = Dispatcher()
 
 
-@routes.post("/api/webhook/{client_id}")
-async def webhook(request: web.Request):
-    """Handle request"""
-    data = await request.json()
-    logger.info(f"Webhook Request: {pformat(data)}")
-    avito: Avito = request.app["avito"]
+@dp.message(from_self=True)
+async def on_own_message(message: WebhookMessage):
+    logger.info(f"Message from self: {message.content.text}")
 
-    update = WebhookUpdate.model_validate(data, context={"avito": avito})
-    message = update.message
-    message_text = message.content.text
-    if message.from_self():
-        logger.info(f"Message from self: {message_text}")
-        return web.Response(text="OK")
 
-    if message.type == "system":
-        logger.info(f"System message: {message_text}")
-        return web.Response(text="OK")
+@dp.message(types=MessageType.SYSTEM)
+async def on_system_message(message: WebhookMessage):
+    logger.info(f"System message: {message.content.text}")
 
-    logger.info(f"Message from user: {message_text}")
+
+@dp.message(types=MessageType.TEXT, chat_types="u2i")
+async def on_text(message: WebhookMessage):
+    logger.info(f"Message from user: {message.content.text}")
     # mark message as read
     await message.read_message_chat()
     await message.answer("Hello, I'm a bot")
 
-    return web.Response(text="OK")
-
 
 async def start_server():
-    app = web.Application()
-
     avito = Avito(
         client_id=CLIENT_ID,
         client_secret=CLIENT_SECRET,
         token=TOKEN,
     )
+    # Avito gets 200 right away, handlers run in the background
+    processor = QueueProcessor(
+        dp,
+        maxsize=1000,
+        overflow=OverflowPolicy.REJECT,
+        workers=4,
+    )
+    app = create_app(avito, processor)
 
     webhook_url = f"{WEBHOOK_URL}/api/webhook/{CLIENT_ID}"
     await avito.set_webhook(webhook_url, unsubscribe_all=True)
     logger.info(f"Webhook set: {webhook_url}")
-    app["avito"] = avito
-    app.add_routes(routes)
+
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(
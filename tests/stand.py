@@ -0,0 +1,117 @@
+"""Local stand-in for api.avito.ru."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections import Counter
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+class AvitoStand:
+    """
+    Serves ``/token`` and answers other paths with ``routes`` handlers or ``{}``.
+
+    Requests with a token other than the last issued one get 403
+    "access token expired". ``hits`` counts requests per path.
+    """
+
+    def __init__(self, user_id: int = 1):
+        self.user_id = user_id
+        self.hits: Counter[str] = Counter()
+        self.routes: dict[str, web.RequestHandler] = {}
+        self.token = "initial"
+        self._tokens = itertools.count(1)
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self.server = TestServer(app)
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("")).rstrip("/")
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        path = request.path.strip("/")
+        self.hits[path] += 1
+        if path == "token":
+            # slow enough for concurrent callers to pile up
+            await asyncio.sleep(0.05)
+            self.token = f"token-{next(self._tokens)}"
+            return web.json_response(
+                {"access_token": self.token, "expires_in": 86400, "token_type": "Bearer"}
+            )
+        if request.headers.get("Authorization") != f"Bearer {self.token}":
+            return web.json_response(
+                {"result": {"message": "access token expired", "status": False}},
+                status=403,
+            )
+        if path in self.routes:
+            return await self.routes[path](request)
+        if path == "core/v1/accounts/self":
+            return web.json_response({"id": self.user_id, "name": "me"})
+        return web.json_response({})
+
+    async def __aenter__(self) -> AvitoStand:
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.server.close()
+
+
+AVATARS = {
+    size: "https://static.avito.ru/a.jpg"
+    for size in (
+        "128x128", "192x192", "24x24", "256x256", "36x36",
+        "48x48", "64x64", "72x72", "96x96",
+    )
+}
+
+
+def message(message_id: str = "m1", created: int = 1700000000) -> dict:
+    """Messenger API message."""
+    return {
+        "author_id": 1,
+        "content": {"text": "hello"},
+        "created": created,
+        "direction": "out",
+        "id": message_id,
+        "isRead": True,
+        "type": "text",
+    }
+
+
+def chat(chat_id: str = "c1", last_message: dict | None = None) -> dict:
+    """Messenger API chat, updated with its last message."""
+    last_message = last_message or message()
+    return {
+        "context": {
+            "type": "item",
+            "value": {
+                "id": 10,
+                "images": {"count": 1, "main": {"140x105": "https://img.avito.st/1.jpg"}},
+                "price_string": "100 ₽",
+                "status_id": 1,
+                "title": "Item",
+                "url": "https://www.avito.ru/item/10",
+                "user_id": 1,
+            },
+        },
+        "created": 1690000000,
+        "id": chat_id,
+        "last_message": last_message,
+        "updated": last_message["created"],
+        "users": [
+            {
+                "id": 1,
+                "name": "me",
+                "public_user_profile": {
+                    "avatar": AVATARS,
+                    "item_id": 10,
+                    "url": "https://www.avito.ru/user/1",
+                    "user_id": 1,
+                },
+            }
+        ],
+    }
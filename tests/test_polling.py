@@ -0,0 +1,95 @@
+import asyncio
+
+from aiohttp import web
+
+from avito import Avito
+from avito.webhook import Poller, UpdateProcessor
+from avito.webhook.polling import AccountState
+
+from .stand import AvitoStand, chat, message
+
+
+class Collector(UpdateProcessor):
+    def __init__(self):
+        self.ids: list[str] = []
+
+    async def submit(self, update) -> None:
+        self.ids.append(update.message.id)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class Messenger:
+    """Chats visible in the listing, messages oldest first."""
+
+    def __init__(self, stand: AvitoStand):
+        self.chats: dict[str, list[dict]] = {}
+        self.stand = stand
+        stand.routes["messenger/v2/accounts/1/chats"] = self.get_chats
+
+    def add(self, chat_id: str, message_id: str, created: int) -> None:
+        messages = self.chats.setdefault(chat_id, [])
+        messages.append(message(message_id, created))
+        messages.sort(key=lambda m: m["created"])
+        self.stand.routes[f"messenger/v3/accounts/1/chats/{chat_id}/messages"] = (
+            self.get_messages
+        )
+
+    async def get_chats(self, request: web.Request) -> web.Response:
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query["limit"])
+        chats = sorted(
+            (chat(chat_id, messages[-1]) for chat_id, messages in self.chats.items()),
+            key=lambda c: -c["updated"],
+        )
+        return web.json_response({"chats": chats[offset:offset + limit]})
+
+    async def get_messages(self, request: web.Request) -> web.Response:
+        chat_id = request.path.strip("/").split("/")[-2]
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query["limit"])
+        messages = self.chats[chat_id][::-1]
+        return web.json_response(
+            {
+                "messages": messages[offset:offset + limit],
+                "meta": {"has_more": offset + limit < len(messages)},
+            }
+        )
+
+
+async def _replay_late_listing() -> tuple[list[str], Poller]:
+    async with AvitoStand() as stand:
+        messenger = Messenger(stand)
+        collector = Collector()
+        async with Avito("initial", "cid", base_url=stand.url, user_id=1) as avito:
+            poller = Poller(avito, collector, page_size=2, overlap=30)
+            poller.accounts[avito.client_id] = AccountState(since=None, interval=1.0)
+
+            async def poll() -> None:
+                await poller.poll(avito.client_id)
+
+            # timestamps are server time, far behind the local clock
+            messenger.add("a", "history", 1000)
+            await poll()
+            messenger.add("a", "m1", 1100)
+            await poll()
+            # created before the newest listed chat, listed 10 seconds late
+            messenger.add("b", "late", 1090)
+            await poll()
+            messenger.add("c", "m3", 1200)
+            await poll()
+            # cursors of a and b are dropped, a starts over at the window
+            messenger.add("a", "m4", 1210)
+            await poll()
+            await poll()
+    return collector.ids, poller
+
+
+def test_late_listed_messages_are_emitted_once():
+    ids, poller = asyncio.run(_replay_late_listing())
+    assert ids == ["m1", "late", "m3", "m4"]
+    assert sorted(poller.accounts["cid"].chats) == ["a", "c"]
@@ -0,0 +1,35 @@
+import asyncio
+
+from aiohttp import web
+
+from avito import Avito
+from avito.methods import GetUserBalance
+
+from .stand import AvitoStand
+
+
+async def _refresh_on_concurrent_expiry(calls: int) -> tuple[AvitoStand, list]:
+    async with AvitoStand() as stand:
+        stand.routes.update(
+            {
+                f"core/v1/accounts/{user_id}/balance": _balance
+                for user_id in range(calls)
+            }
+        )
+        async with Avito("stale", "client_id", "secret", base_url=stand.url) as avito:
+            results = await asyncio.gather(
+                *(avito(GetUserBalance(user_id=user_id)) for user_id in range(calls)),
+                return_exceptions=True,
+            )
+    return stand, results
+
+
+async def _balance(request):
+    return web.json_response({"bonus": 0, "real": 100})
+
+
+def test_concurrent_expiry_refreshes_token_once():
+    stand, results = asyncio.run(_refresh_on_concurrent_expiry(200))
+    assert stand.hits["token"] == 1
+    assert [r for r in results if isinstance(r, BaseException)] == []
+    assert all(r.real == 100 for r in results)
@@ -0,0 +1,30 @@
+import asyncio
+
+from aiohttp import web
+
+from avito import Avito
+
+from .stand import AvitoStand
+
+UPLOAD = "messenger/v1/accounts/1/uploadImages"
+
+
+def test_file_upload_is_sent_with_content_length(tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"x" * 300_000)
+    headers = {}
+
+    async def upload(request: web.Request) -> web.Response:
+        headers.update(request.headers)
+        await request.read()
+        return web.json_response({"image-1": {}})
+
+    async def main():
+        async with AvitoStand() as stand:
+            stand.routes[UPLOAD] = upload
+            async with Avito("initial", base_url=stand.url, user_id=1) as avito:
+                return await avito.upload_image(path)
+
+    assert asyncio.run(main()) == "image-1"
+    assert "Transfer-Encoding" not in headers
+    assert int(headers["Content-Length"]) > 300_000
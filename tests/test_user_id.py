@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from avito import Avito
+from avito.exceptions import AvitoError
+from avito.methods import GetChats
+from avito.models import WebhookMessage
+
+from .stand import AvitoStand, chat, message
+
+SELF = "core/v1/accounts/self"
+UPLOAD = "messenger/v1/accounts/1/uploadImages"
+SEND_IMAGE = "messenger/v1/accounts/1/chats/c1/messages/image"
+
+MESSAGE = message()
+CHAT = chat()
+
+
+def run_with_stand(func):
+    async def main():
+        async with AvitoStand() as stand:
+            stand.routes.update(
+                {
+                    UPLOAD: _json({"image-1": {}}),
+                    SEND_IMAGE: _json(MESSAGE),
+                    "messenger/v2/accounts/1/chats": _json({"chats": [CHAT]}),
+                }
+            )
+            await func(stand)
+            return stand
+
+    return asyncio.run(main())
+
+
+def _json(data):
+    return _json_status(data, 200)
+
+
+def _json_status(data, status):
+    async def handler(request: web.Request) -> web.Response:
+        await request.read()
+        return web.json_response(data, status=status)
+
+    return handler
+
+
+def test_concurrent_resolve_requests_self_info_once():
+    async def scenario(stand):
+        async with Avito("initial", base_url=stand.url) as avito:
+            ids = await asyncio.gather(*(avito.resolve_user_id() for _ in range(10)))
+        assert ids == [1] * 10
+
+    stand = run_with_stand(scenario)
+    assert stand.hits[SELF] == 1
+
+
+def test_pinned_user_id_skips_self_info():
+    async def scenario(stand):
+        async with Avito("initial", base_url=stand.url, user_id=1) as avito:
+            assert await avito.resolve_user_id() == 1
+            await avito.send_image("c1", b"image")
+
+    stand = run_with_stand(scenario)
+    assert stand.hits[SELF] == 0
+
+
+def test_send_image_uploads_and_sends_once():
+    async def scenario(stand):
+        async with Avito("initial", base_url=stand.url) as avito:
+            message = await avito.send_image("c1", b"image")
+        assert message.id == "m1"
+
+    stand = run_with_stand(scenario)
+    assert (stand.hits[SELF], stand.hits[UPLOAD], stand.hits[SEND_IMAGE]) == (1, 1, 1)
+
+
+def test_webhook_answer_image_uses_receiving_account():
+    async def scenario(stand):
+        async with Avito("initial", base_url=stand.url) as avito:
+            message = avito.parse(
+                WebhookMessage,
+                {
+                    "author_id": 5,
+                    "chat_id": "c1",
+                    "chat_type": "u2i",
+                    "content": {"text": "hi"},
+                    "created": 1700000000,
+                    "id": "m0",
+                    "type": "text",
+                    "user_id": 1,
+                },
+            )
+            await (await message.answer_image(b"image"))
+
+    stand = run_with_stand(scenario)
+    assert (stand.hits[SELF], stand.hits[UPLOAD], stand.hits[SEND_IMAGE]) == (0, 1, 1)
+
+
+def test_chats_are_bound_to_account_of_their_request():
+    async def scenario(stand):
+        async with Avito("initial", base_url=stand.url) as avito:
+            for trusted in (False, True):
+                chats = await avito(GetChats(user_id=1), trusted=trusted)
+                assert chats.chats[0].read().user_id == 1
+            # the client itself does not adopt the id of a request
+            assert avito.user_id is None
+
+    stand = run_with_stand(scenario)
+    assert stand.hits[SELF] == 0
+
+
+def test_failed_chats_request_does_not_pin_user_id():
+    async def scenario(stand):
+        stand.routes["messenger/v2/accounts/999/chats"] = _json_status({}, 403)
+        async with Avito("initial", base_url=stand.url) as avito:
+            with pytest.raises(AvitoError):
+                await avito(GetChats(user_id=999))
+            assert await avito.resolve_user_id() == 1
+
+    run_with_stand(scenario)
+
+
+def test_unknown_user_id_raises_clear_error():
+    chat = Avito("initial").parse(GetChats.__returning__, {"chats": [CHAT]}).chats[0]
+    with pytest.raises(AvitoError, match="resolve_user_id"):
+        chat.read()